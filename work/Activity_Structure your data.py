@@ -31,6 +31,21 @@ import numpy as np
 import seaborn as sns 
 import matplotlib.pyplot as plt 
 
+from unicorn_eda import (
+    Deduplicator,
+    Histogram,
+    IntCounts,
+    configure_from_env,
+    derive,
+    load_companies,
+    month_histogram,
+    stage,
+    top_k,
+)
+
+# Time each pipeline stage when UNICORN_EDA_PROFILE names a file (or "-").
+configure_from_env()
+
 
 # ### Load the dataset into a DataFrame
 # 
@@ -42,7 +57,7 @@ import matplotlib.pyplot as plt
 # RUN THIS CELL TO IMPORT YOUR DATA.
 
 ### YOUR CODE HERE ###
-companies = pd.read_csv("Unicorn_Companies.csv")
+companies = load_companies("Unicorn_Companies.csv")
 
 
 # ## Step 2: Data exploration
@@ -85,8 +100,9 @@ companies.shape
 # Assuming you have a DataFrame named 'companies'
 original_shape = companies.shape
 
-# Drop duplicates from the DataFrame
-companies = companies.drop_duplicates()
+# Drop duplicates from the DataFrame by comparing 64-bit row fingerprints
+dedup = Deduplicator()
+companies = dedup.drop_duplicates(companies)
 
 # Compare the shape before and after dropping duplicates
 new_shape = companies.shape
@@ -94,6 +110,7 @@ new_shape = companies.shape
 # Print the original and new shape
 print("Original Shape:", original_shape)
 print("New Shape:", new_shape)
+print("Duplicates Dropped:", dedup.rows_dropped)
 
 
 # No dupliactes in the values
@@ -122,8 +139,9 @@ companies.dtypes
 
 # Sort `companies` and display the first 10 rows of the resulting DataFrame.
 
-# Sort the DataFrame by 'year founded' in descending order
-companies_sorted = companies.sort_values(by='Year Founded', ascending=False)
+# Select the 10 most recently founded companies (latest `Year Founded` first)
+# without sorting the whole DataFrame
+companies_sorted = top_k(companies, 'Year Founded', 10)
 companies_sorted.head (10)
 
 
@@ -137,7 +155,9 @@ companies_sorted.head (10)
 # Display each unique year that occurs in the dataset
 # along with the number of companies that were founded in each unique year.
 
-company_counts = companies['Year Founded'].value_counts()
+with stage("count year founded", rows_in=len(companies)) as record:
+    company_counts = companies['Year Founded'].value_counts()
+    record.rows_out = len(company_counts)
 
 # Print the number of companies founded each year
 print(company_counts)
@@ -150,8 +170,8 @@ print(company_counts)
 # In[18]:
 
 
-# Plot a histogram of the Year Founded feature.
-plt.hist(companies['Year Founded'], bins=30)
+# Plot a histogram of the Year Founded feature from precomputed bin counts.
+Histogram.from_values(companies['Year Founded'], bins=30).plot()
 plt.xlabel('Year Founded')
 plt.ylabel('Count')
 plt.title('Histogram of Year Founded')
@@ -171,8 +191,14 @@ plt.show()
 # Convert the `Date Joined` column to datetime.
 # Update the column with the converted values.
 
-companies_new = companies.copy()  # Create a copy of the DataFrame
-companies_new['Date Joined'] = pd.to_datetime(companies_new['Date Joined'])
+# `Date Joined` is already datetime64, parsed once by the loader with an
+# explicit %m/%d/%y format.  Derive every feature used below in one pass; the
+# new frame shares the existing columns with `companies` instead of copying them.
+companies_new = derive(
+    companies,
+    ['Year Joined', 'Month Number Joined', 'Month Joined', 'Years to Unicorn'],
+    inplace=False,
+)
 
 # Display the data types of the columns in the new DataFrame
 print(companies_new.dtypes)
@@ -182,10 +208,7 @@ print(companies.dtypes)
 # In[29]:
 
 
-## Extract Year Joined form Date Joined.
-
-companies_new['Year Joined'] = pd.to_datetime(companies_new['Date Joined']).dt.year
-
+## Year Joined was extracted from Date Joined by `derive` above.
 
 # Print the DataFrame with the new 'Year Joined' column
 companies_new.head(10)
@@ -196,7 +219,9 @@ companies_new.head(10)
 
 # Display each unique year which companies joined unicorn status that occurs in the dataset
 
-company_unicorn_count = companies_new['Year Joined'].value_counts()
+with stage("count year joined", rows_in=len(companies_new)) as record:
+    company_unicorn_count = companies_new['Year Joined'].value_counts()
+    record.rows_out = len(company_unicorn_count)
 
 # Print the number of companies founded each year
 print(company_unicorn_count)
@@ -208,9 +233,9 @@ print(company_unicorn_count)
 # Obtain the names of the months when companies gained unicorn status.
 # Use the result to create a `Month Joined` column.
 
-companies_new['Month Joined'] = pd.to_datetime(companies_new['Date Joined']).dt.month
-
-company_unicorn_Month_Count = companies_new['Month Joined'].value_counts()
+with stage("count month number joined", rows_in=len(companies_new)) as record:
+    company_unicorn_Month_Count = companies_new['Month Number Joined'].value_counts()
+    record.rows_out = len(company_unicorn_Month_Count)
 
 # Display the first few rows of `companies`
 # to confirm that the new column did get added.
@@ -221,8 +246,7 @@ print(company_unicorn_Month_Count)
 # In[32]:
 
 
-companies_new['Month Joined'] = pd.to_datetime(companies_new['Date Joined']).dt.strftime('%b')
-
+# `Month Joined` holds month abbreviations as an ordered categorical.
 # Print the DataFrame with the new 'Month Joined' column
 companies_new.head(20)
 
@@ -230,7 +254,9 @@ companies_new.head(20)
 # In[33]:
 
 
-company_unicorn_Month_Count = companies_new['Month Joined'].value_counts()
+with stage("count month joined", rows_in=len(companies_new)) as record:
+    company_unicorn_Month_Count = companies_new['Month Joined'].value_counts()
+    record.rows_out = len(company_unicorn_Month_Count)
 print(company_unicorn_Month_Count)
 
 
@@ -238,14 +264,11 @@ print(company_unicorn_Month_Count)
 
 
 # Plot a histogram of the Year Founded feature.
-months_ordered = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-
-
-plt.hist(companies_new['Month Joined'], bins=12, edgecolor='black')
+# The month histogram is labelled Jan..Dec in calendar order.
+month_histogram(companies_new['Month Number Joined']).plot(edgecolor='black')
 plt.xlabel('Month Joined')
 plt.ylabel('Count')
 plt.title('Histogram of Date Joined')
-plt.xticks(months_ordered)
 plt.show()
 
 
@@ -261,8 +284,6 @@ plt.show()
 
 
 
-companies_new['Years to Unicorn'] = companies_new['Year Joined'] - companies_new['Year Founded']
-
 # Print the DataFrame with the new 'Years to Unicorn' column
 
 companies_new.head(10)
@@ -272,7 +293,7 @@ companies_new.head(10)
 
 
 # Plot a histogram of the Year to join.
-plt.hist(companies_new['Years to Unicorn'], bins=30)
+Histogram.from_values(companies_new['Years to Unicorn'], bins=30).plot()
 plt.xlabel('Year to Unicorn')
 plt.ylabel('Count')
 plt.title('Histogram of Years to Unicorn')
@@ -290,9 +311,11 @@ plt.show()
 # In[46]:
 
 
-mean_years_to_unicorn = companies_new['Years to Unicorn'].mean()
-mode_years_to_unicorn = companies_new['Years to Unicorn'].mode().values[0]
-median_years_to_unicorn = companies_new['Years to Unicorn'].median()
+# One counting pass gives the mean, mode and median of the small integer range.
+years_to_unicorn_stats = IntCounts(companies_new['Years to Unicorn']).describe()
+mean_years_to_unicorn = years_to_unicorn_stats['mean']
+mode_years_to_unicorn = years_to_unicorn_stats['mode']
+median_years_to_unicorn = years_to_unicorn_stats['median']
 
 print("Mean Years to Unicorn:", mean_years_to_unicorn)
 print("Mode Years to Unicorn:", mode_years_to_unicorn)
@@ -309,7 +332,9 @@ print("Median Years to Unicorn:",median_years_to_unicorn)
 # Filter dataset by a year of your interest (in terms of when companies reached unicorn status).
 # Save the resulting subset in a new variable. 
 
-joined_2015 = companies_new[companies_new['Year Joined'] == 2015]
+with stage("filter joined 2015", rows_in=len(companies_new)) as record:
+    joined_2015 = companies_new[companies_new['Year Joined'] == 2015]
+    record.rows_out = len(joined_2015)
 
 
 # Display the first few rows of the subset to confirm that it was created.
@@ -322,7 +347,9 @@ print(joined_2015)
 
 
 # Determine the most common industry for companies joined in 2015
-most_common_industry = joined_2015['Industry'].mode().values[0]
+with stage("mode industry 2015", rows_in=len(joined_2015)) as record:
+    most_common_industry = joined_2015['Industry'].mode().values[0]
+    record.rows_out = 1
 
 print("Most Common Industry for Companies Joined in 2015:", most_common_industry)
 
@@ -330,22 +357,19 @@ print("Most Common Industry for Companies Joined in 2015:", most_common_industry
 # In[60]:
 
 
-top_3_industries = joined_2015['Industry'].value_counts().head(3).index.tolist()
+with stage("top 3 industries 2015", rows_in=len(joined_2015)) as record:
+    top_3_industries = joined_2015['Industry'].value_counts().head(3).index.tolist()
+    record.rows_out = len(top_3_industries)
 print("Most Common Industry for Companies Joined in 2015:", top_3_industries)
 
 
 # In[82]:
 
 
-companies_new['Valuation (in Billions)'] = companies_new['Valuation'].str.extract('(\d+\.?\d*)B', expand=False).astype(float)
-#companies_new['Funding (in Billions)'] = companies_new['Funding'].str.extract('(\d+\.?\d*)M','(\d+\.?\d*)B', expand=False).astype(float)
-#companies_new['Funding (in Billions)'] = companies_new['Funding'].str.extract('(\d+\.?\d*)B', expand=False).astype(float)
-
-#companies_new['Funding'].str.extract('(\d+\.?\d*)M', expand=False).astype(float)
-companies_new['Funding'].str.extract('(\d+\.?\d*)B', expand=False).astype(float)
-
-#companies['Funding (in Millions)'] = funding_millions
-#companies['Funding (in Billions)'] = funding_billions * 1000
+# `Valuation` and `Funding` are parsed to float dollars by the loader, so
+# `$...M` amounts are included instead of silently becoming NaN.
+companies_new['Valuation (in Billions)'] = companies_new['Valuation'] / 1e9
+companies_new['Funding (in Billions)'] = companies_new['Funding'] / 1e9
 
 print
 companies_new.head(10)
@@ -358,7 +382,9 @@ companies_new.head(10)
 # In[62]:
 
 
-top_5_companies = companies_new.groupby('Industry').agg({'Valuation': 'sum', 'Funding': 'sum'}).nlargest(5, 'Valuation')
+with stage("top 5 industries by valuation", rows_in=len(companies_new)) as record:
+    top_5_companies = companies_new.groupby('Industry').agg({'Valuation': 'sum', 'Funding': 'sum'}).nlargest(5, 'Valuation')
+    record.rows_out = len(top_5_companies)
 
 print(top_5_companies)
 
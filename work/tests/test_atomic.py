@@ -0,0 +1,28 @@
+import pytest
+
+from unicorn_eda.atomic import atomic_path
+
+
+def test_failed_write_leaves_target_untouched(tmp_path):
+    target = tmp_path / "cache" / "categories.json"
+    with atomic_path(target) as tmp:
+        tmp.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_path(target) as tmp:
+            tmp.write_text("half")
+            raise RuntimeError
+
+    assert target.read_text() == "old"
+    assert [path.name for path in target.parent.iterdir()] == ["categories.json"]
+
+
+def test_directory_is_swapped_in(tmp_path):
+    target = tmp_path / "store"
+    for name in ("a.npy", "b.npy"):
+        with atomic_path(target) as tmp:
+            tmp.mkdir()
+            (tmp / name).write_bytes(b"")
+
+    assert [path.name for path in tmp_path.iterdir()] == ["store"]
+    assert [path.name for path in target.iterdir()] == ["b.npy"]
@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from unicorn_eda.cube import AggregateCube
+from unicorn_eda.features import derive
+from unicorn_eda.loader import load_companies
+
+
+CSV = Path(__file__).resolve().parents[1] / "Unicorn_Companies.csv"
+
+
+@pytest.fixture(scope="module")
+def companies():
+    frame = load_companies(CSV, use_cache=False)
+    # Missing dimension values: no industry for two rows, no join date for three.
+    frame.loc[[0, 1], "Industry"] = np.nan
+    frame.loc[[2, 3, 4], "Date Joined"] = pd.NaT
+    return frame
+
+
+@pytest.fixture(scope="module")
+def cube(companies):
+    return AggregateCube.from_frame(companies)
+
+
+def _eager(companies, by):
+    frame = derive(companies, ["Year Joined"], inplace=False)
+    grouped = frame.groupby(by, dropna=False, observed=True)
+    return grouped.size(), grouped["Valuation"].sum()
+
+
+@pytest.mark.parametrize("by", ["Industry", "Year Joined"])
+def test_missing_values_form_one_nan_group(companies, cube, by):
+    result = cube.query(by)
+    sizes, valuation = _eager(companies, by)
+    assert result.index.is_unique
+    assert result.index.isna().sum() == 1
+    assert len(result) == len(sizes)
+    assert int(result[("Companies", "count")].sum()) == len(companies)
+    missing = result[result.index.isna()]
+    assert int(missing[("Companies", "count")].iloc[0]) == int(sizes[sizes.index.isna()].iloc[0])
+    assert float(missing[("Valuation", "sum")].iloc[0]) == pytest.approx(
+        float(valuation[valuation.index.isna()].iloc[0])
+    )
+
+
+def test_no_negative_year_label(cube):
+    years = cube.labels["Year Joined"]
+    assert (years.dropna() > 0).all()
+    assert not years.isna().any()
+
+
+def test_top_has_no_duplicate_groups(cube):
+    top = cube.top(50, "Industry")
+    assert top.index.is_unique
+
+
+def test_query_arrays_matches_query(cube):
+    labels, columns = cube.query_arrays(["Year Joined", "Quarter"])
+    result = cube.query(["Year Joined", "Quarter"])
+    assert np.array_equal(
+        labels["Year Joined"], result.index.get_level_values("Year Joined").to_numpy(), equal_nan=True
+    )
+    for column, values in columns.items():
+        assert np.array_equal(values, result[column].to_numpy(), equal_nan=True)
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+from unicorn_eda.history import valuation_history
+
+
+def test_valuation_history_sorted_by_key_then_time():
+    frame = pd.DataFrame({
+        "Company": ["Zwift", "Canva", "Zwift", "Canva", "Canva"],
+        "Snapshot Date": pd.to_datetime(
+            ["2022-01-01", "2022-02-01", "2022-02-01", "2022-01-01", "2022-03-01"]
+        ),
+        "Valuation": [1.0, np.nan, 2.0, 40.0, np.nan],
+    })
+
+    history = valuation_history(frame)
+
+    assert history["Company"].tolist() == ["Canva", "Canva", "Canva", "Zwift", "Zwift"]
+    assert history.index.tolist() == [3, 1, 4, 0, 2]
+    # Missing on both sides (Canva, March) is not a revaluation.
+    assert history["Revalued"].tolist() == [False, False, False, False, True]
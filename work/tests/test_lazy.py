@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from unicorn_eda.features import derive
+from unicorn_eda.lazy import col, scan_csv
+from unicorn_eda.loader import load_companies
+
+
+CSV = Path(__file__).resolve().parents[1] / "Unicorn_Companies.csv"
+
+FILTERS = {
+    "joined_2015": (col("Year Joined") == 2015, lambda f: f["Year Joined"] == 2015),
+    "fintech": (col("Industry") == "Fintech", lambda f: f["Industry"] == "Fintech"),
+    "over_20b": (col("Valuation") > 20e9, lambda f: f["Valuation"] > 20e9),
+}
+
+# Each plan is a list of ("filter", name) and ("top_k", k, column) steps.
+PLANS = {
+    "filter_then_top_k": [("filter", "joined_2015"), ("top_k", 10, "Valuation")],
+    "top_k_then_filter": [("top_k", 10, "Valuation"), ("filter", "joined_2015")],
+    "top_k_then_raw_filter": [("top_k", 50, "Valuation"), ("filter", "fintech")],
+    "filter_top_k_filter": [
+        ("filter", "fintech"), ("top_k", 20, "Funding"), ("filter", "over_20b"),
+    ],
+    "top_k_filter_top_k": [
+        ("top_k", 100, "Valuation"), ("filter", "fintech"), ("top_k", 5, "Funding"),
+    ],
+}
+
+
+@pytest.fixture(scope="module")
+def companies():
+    frame = load_companies(CSV, use_cache=False)
+    derive(frame, ["Year Joined"])
+    return frame
+
+
+def _lazy(steps):
+    query = scan_csv(CSV)
+    for step in steps:
+        if step[0] == "filter":
+            query = query.filter(FILTERS[step[1]][0])
+        else:
+            query = query.top_k(step[1], step[2])
+    return query.collect()
+
+
+def _eager(frame, steps):
+    for step in steps:
+        if step[0] == "filter":
+            frame = frame[FILTERS[step[1]][1](frame)]
+        else:
+            frame = frame.sort_values(step[2], ascending=False, kind="stable").head(step[1])
+    return frame
+
+
+@pytest.mark.parametrize("name", sorted(PLANS))
+def test_collect_matches_eager(companies, name):
+    lazy = _lazy(PLANS[name])
+    eager = _eager(companies, PLANS[name])
+    assert sorted(lazy.index) == sorted(eager.index)
+    assert lazy["Company"].astype(str).tolist() == eager.loc[lazy.index, "Company"].astype(str).tolist()
+
+
+def test_top_k_then_filter_can_be_empty(companies):
+    result = scan_csv(CSV).top_k(10, "Valuation").filter(col("Year Joined") == 2015).collect()
+    assert len(result) == len(_eager(companies, PLANS["top_k_then_filter"]))
+
+
+def test_unknown_filter_column_after_top_k():
+    with pytest.raises(KeyError):
+        scan_csv(CSV).top_k(10, "Valuation").filter(col("Nope") == 1).collect()
@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+
+from unicorn_eda.money import parse_money
+
+
+def test_units_and_separators():
+    parsed = parse_money(["$180B", "$850M", "$1.5K", "$1,234", "$0M", "2T"])
+    assert np.allclose(parsed, [180e9, 850e6, 1.5e3, 1234, 0, 2e12])
+
+
+def test_unparseable_values_are_nan():
+    parsed = parse_money(pd.Series(["Unknown", "", None, "$5M"], dtype=object))
+    assert np.isnan(parsed[:3]).all()
+    assert parsed[3] == 5e6
+
+
+def test_non_ascii_values_are_nan():
+    parsed = parse_money(pd.Series(["$1B", "€5M", "$2M", "5M\u00a0"], dtype="str"))
+    assert parsed[0] == 1e9
+    assert np.isnan(parsed[1])
+    assert parsed[2] == 2e6
+    assert np.isnan(parsed[3])
@@ -0,0 +1,23 @@
+import shutil
+from pathlib import Path
+
+from unicorn_eda.memo import ResultCache
+from unicorn_eda.service import UnicornQueries
+
+
+CSV = Path(__file__).resolve().parents[1] / "Unicorn_Companies.csv"
+
+
+def test_from_path_drops_answers_for_old_contents(tmp_path):
+    path = tmp_path / CSV.name
+    shutil.copy(CSV, path)
+    cache = ResultCache(directory=tmp_path / "results")
+    old = UnicornQueries.from_path(path, cache).fingerprint
+    cache.put(old, "/health?", "ok")
+
+    with open(path, "a", encoding="utf-8") as handle:
+        handle.write(open(CSV, encoding="utf-8").read().splitlines()[1] + "\n")
+    new = UnicornQueries.from_path(path, ResultCache(directory=tmp_path / "results"))
+
+    assert new != old
+    assert not (tmp_path / "results" / old[:16]).exists()
@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from unicorn_eda.loader import load_companies
+from unicorn_eda.streaming import summarize_csv, summarize_frame
+
+
+CSV = Path(__file__).resolve().parents[1] / "Unicorn_Companies.csv"
+
+
+def test_summarize_frame_agrees_with_summarize_csv():
+    frame = load_companies(CSV, use_cache=False)
+    frame = pd.concat([frame, frame.head(3)], ignore_index=True)
+
+    in_memory = summarize_frame(frame)
+    streamed = summarize_csv(CSV)
+
+    assert in_memory.duplicates_dropped == streamed.duplicates_dropped + 3
+    assert in_memory.rows_kept == streamed.rows_kept
+    np.testing.assert_array_equal(in_memory.year_joined.counts, streamed.year_joined.counts)
+    pd.testing.assert_frame_equal(in_memory.top_industries(), streamed.top_industries())
@@ -0,0 +1,87 @@
+"""Shared structuring helpers for the unicorn companies EDA.
+
+The notebooks and ``Activity_Structure your data.py`` load and structure
+``Unicorn_Companies.csv`` through this package so that every analysis uses
+one schema and one set of parsing rules.
+"""
+
+from .buckets import TimeBuckets, bucket_ids
+from .cube import AggregateCube
+from .dates import DateMemo, date_parts, parse_dates
+from .dedup import Deduplicator, fingerprint
+from .encoding import CATEGORICAL_COLUMNS, CategoryDictionary
+from .features import FEATURES, derive
+from .histogram import Histogram, HistogramCache, month_histogram
+from .history import asof_join, snapshot_dates, valuation_history
+from .incremental import CountTree, IncrementalStats
+from .index import TableIndex
+from .ingest import ingest_snapshots
+from .instrument import configure_from_env, instrumented, stage
+from .investors import InvestorIndex
+from .lazy import LazyFrame, col, scan_csv
+from .loader import SCHEMA, load_companies, read_companies_csv
+from .memo import ResultCache, normalize_query
+from .money import parse_money
+from .names import NameIndex, normalize_names
+from .render import ChartSpec, eda_chart_specs, render_chart, render_charts
+from .stats import IntCounts, KLLSketch, describe_values, summarize_values
+from .store import ColumnStore, open_store, save_store
+from .streaming import PipelineSummary, summarize_csv, summarize_frame
+from .topk import select_positions, top_k, top_k_by_group
+
+__all__ = [
+    "AggregateCube",
+    "CATEGORICAL_COLUMNS",
+    "CategoryDictionary",
+    "ChartSpec",
+    "ColumnStore",
+    "CountTree",
+    "DateMemo",
+    "Deduplicator",
+    "FEATURES",
+    "Histogram",
+    "HistogramCache",
+    "IncrementalStats",
+    "configure_from_env",
+    "IntCounts",
+    "InvestorIndex",
+    "KLLSketch",
+    "LazyFrame",
+    "NameIndex",
+    "PipelineSummary",
+    "ResultCache",
+    "SCHEMA",
+    "TableIndex",
+    "TimeBuckets",
+    "asof_join",
+    "bucket_ids",
+    "col",
+    "date_parts",
+    "derive",
+    "describe_values",
+    "eda_chart_specs",
+    "fingerprint",
+    "ingest_snapshots",
+    "instrumented",
+    "load_companies",
+    "month_histogram",
+    "normalize_names",
+    "normalize_query",
+    "open_store",
+    "parse_dates",
+    "parse_money",
+    "read_companies_csv",
+    "render_chart",
+    "render_charts",
+    "save_store",
+    "scan_csv",
+    "select_positions",
+    "snapshot_dates",
+    "stage",
+    "summarize_csv",
+    "summarize_frame",
+    "summarize_values",
+    "top_k",
+    "top_k_by_group",
+    "valuation_history",
+]
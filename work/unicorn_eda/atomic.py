@@ -0,0 +1,63 @@
+"""Atomic replacement of files and directories on disk.
+
+Everything the package writes for later runs -- Parquet caches, category
+dictionaries, memoized results, rendered charts, column stores -- goes to a
+temporary sibling first and is renamed into place with :func:`atomic_path`,
+so readers see either the previous version or the complete new one::
+
+    with atomic_path(".unicorn_cache/categories.json") as tmp:
+        tmp.write_text(text, encoding="utf-8")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import shutil
+from pathlib import Path
+
+
+def _remove(path):
+    if path.is_dir() and not path.is_symlink():
+        shutil.rmtree(path)
+    else:
+        path.unlink(missing_ok=True)
+
+
+def _swap_directory(tmp, path):
+    """Move directory ``tmp`` onto the existing directory ``path``."""
+    # The old directory is moved aside rather than deleted first, so it
+    # survives until the new one is in place (and is restored on failure).
+    old = path.with_name(f"{path.name}.{os.getpid()}.old")
+    _remove(old)
+    os.replace(path, old)
+    try:
+        os.replace(tmp, path)
+    except BaseException:
+        os.replace(old, path)
+        raise
+    _remove(old)
+
+
+@contextlib.contextmanager
+def atomic_path(path):
+    """Yield a temporary sibling of ``path`` to write; move it onto ``path`` on success.
+
+    The temporary name includes the process id, so concurrent writers do not
+    collide.  If the block raises, the temporary file (or directory) is
+    removed and ``path`` is left untouched.  A directory replacing an
+    existing one is swapped in with two renames: the old one is moved aside
+    and only removed once the new one is in place.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    _remove(tmp)
+    try:
+        yield tmp
+        if tmp.is_dir() and path.exists():
+            _swap_directory(tmp, path)
+        else:
+            os.replace(tmp, path)
+    finally:
+        _remove(tmp)
@@ -0,0 +1,245 @@
+"""Benchmarks of the structuring pipeline on synthetic unicorn-shaped data.
+
+Run from the ``work`` directory::
+
+    python -m unicorn_eda.bench --sizes 1000 100000 --save-baseline bench.json
+    python -m unicorn_eda.bench --sizes 1000 100000 --baseline bench.json
+
+Every size gets a synthetic CSV with ``$xxB`` / ``$xxxM`` / ``Unknown`` money
+strings, ``m/d/yy`` dates and investor lists.  Each stage (load, dedup, date
+parsing, money parsing, category encoding, group-bys, histograms) is timed
+and its peak traced memory recorded.  With ``--baseline`` the run is compared
+against a stored result and the command exits non-zero on a regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cube import AggregateCube
+from .dates import DateMemo, date_parts
+from .dedup import Deduplicator
+from .encoding import CATEGORICAL_COLUMNS, CategoryDictionary
+from .histogram import Histogram, month_histogram
+from .instrument import configure_from_env
+from .loader import SCHEMA, csv_dtypes, load_companies
+from .money import parse_money
+
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+
+_INDUSTRIES = [
+    "Fintech", "Internet software & services", "E-commerce & direct-to-consumer",
+    "Artificial intelligence", "Health", "Other", "Supply chain, logistics, & delivery",
+    "Cybersecurity", "Data management & analytics", "Mobile & telecommunications",
+    "Hardware", "Auto & transportation", "Edtech", "Consumer & retail", "Travel",
+]
+_PLACES = [
+    ("San Francisco", "United States", "North America"),
+    ("New York", "United States", "North America"),
+    ("Beijing", "China", "Asia"),
+    ("Shanghai", "China", "Asia"),
+    ("Bengaluru", "India", "Asia"),
+    ("London", "United Kingdom", "Europe"),
+    ("Berlin", "Germany", "Europe"),
+    ("Paris", "France", "Europe"),
+    ("Sao Paulo", "Brazil", "South America"),
+    ("Sydney", "Australia", "Oceania"),
+    ("Lagos", "Nigeria", "Africa"),
+    ("Toronto", "Canada", "North America"),
+]
+
+
+def synthesize_companies(n_rows, seed=0, duplicate_fraction=0.01):
+    """Return ``n_rows`` of raw, CSV-shaped unicorn rows (all text but Year Founded)."""
+    rng = np.random.default_rng(seed)
+    n_unique = max(n_rows - int(n_rows * duplicate_fraction), 1)
+
+    def pick(pool, size):
+        pool = np.asarray(pool, dtype=object)
+        return pool[rng.integers(0, len(pool), size)]
+
+    # Distinct dates are few compared to rows, as in the real file.
+    days = rng.integers(np.datetime64("2007-01-01", "D").astype(int),
+                        np.datetime64("2022-12-31", "D").astype(int), 5000)
+    dates = pd.to_datetime(days, unit="D")
+    date_pool = [f"{d.month}/{d.day}/{d.year % 100:02d}" for d in dates]
+    joined_year = dates.year.to_numpy()
+
+    valuation_pool = [f"${v}B" for v in range(1, 201)]
+    funding_pool = [f"${v}M" for v in range(0, 1000)] + [f"${v}B" for v in range(1, 15)] + ["Unknown"]
+    investor_names = np.array([f"Investor {i}" for i in range(5000)], dtype=object)
+    investor_pool = [
+        ", ".join(investor_names[rng.integers(0, len(investor_names), rng.integers(1, 5))])
+        for _ in range(20000)
+    ]
+
+    date_index = rng.integers(0, len(date_pool), n_unique)
+    place = rng.integers(0, len(_PLACES), n_unique)
+    frame = pd.DataFrame({
+        "Company": pd.Series(np.arange(n_unique)).astype(str).radd("Company "),
+        "Valuation": pick(valuation_pool, n_unique),
+        "Date Joined": np.asarray(date_pool, dtype=object)[date_index],
+        "Industry": pick(_INDUSTRIES, n_unique),
+        "City": np.array([p[0] for p in _PLACES], dtype=object)[place],
+        "Country/Region": np.array([p[1] for p in _PLACES], dtype=object)[place],
+        "Continent": np.array([p[2] for p in _PLACES], dtype=object)[place],
+        "Year Founded": joined_year[date_index] - rng.integers(0, 20, n_unique),
+        "Funding": pick(funding_pool, n_unique),
+        "Select Investors": pick(investor_pool, n_unique),
+    })
+    if n_rows > n_unique:
+        duplicates = frame.iloc[rng.integers(0, n_unique, n_rows - n_unique)]
+        frame = pd.concat([frame, duplicates], ignore_index=True)
+    return frame
+
+
+def _measure(function, *args, trace_memory=True):
+    """Run ``function`` and return ``(result, metrics)``.
+
+    tracemalloc slows allocation-heavy code down several times, so timings
+    come from an untraced run and peak memory from a second, traced run.
+    """
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    result = function(*args)
+    metrics = {
+        "seconds": time.perf_counter() - start_wall,
+        "cpu_seconds": time.process_time() - start_cpu,
+        "peak_bytes": 0,
+    }
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            function(*args)
+            metrics["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result, metrics
+
+
+def _structure_categories(raw):
+    categories = CategoryDictionary()
+    return {column: categories.encode(column, raw[column]) for column in CATEGORICAL_COLUMNS}
+
+
+def benchmark_size(n_rows, directory, seed=0, trace_memory=True):
+    """Time every pipeline stage on ``n_rows`` synthetic rows; returns ``{stage: metrics}``."""
+    path = Path(directory) / f"synthetic-{n_rows}.csv"
+    if not path.exists():
+        synthesize_companies(n_rows, seed).to_csv(path, index=False)
+
+    results = {}
+    measure = functools.partial(_measure, trace_memory=trace_memory)
+    _, results["load"] = measure(lambda: load_companies(path, use_cache=False))
+    # The stages below time the load's steps one by one, starting from text.
+    raw = pd.read_csv(path, usecols=list(SCHEMA), dtype=csv_dtypes(SCHEMA))
+    raw, results["dedup"] = measure(lambda: Deduplicator().drop_duplicates(raw))
+    joined, results["dates"] = measure(lambda: DateMemo().parse(raw["Date Joined"]))
+    money, results["money"] = measure(
+        lambda: {column: parse_money(raw[column]) for column in ("Valuation", "Funding")}
+    )
+    categories, results["categories"] = measure(_structure_categories, raw)
+
+    frame = pd.DataFrame({
+        **categories,
+        **money,
+        "Date Joined": joined,
+        "Year Founded": raw["Year Founded"].array,
+    })
+    _, results["groupby"] = measure(
+        lambda: AggregateCube.from_frame(frame).query("Industry").nlargest(5, ("Valuation", "sum"))
+    )
+
+    def histograms():
+        parts = date_parts(joined)
+        years_to_unicorn = parts["year"] - frame["Year Founded"].to_numpy(np.float64, na_value=np.nan)
+        return (
+            Histogram.from_values(frame["Year Founded"], bins=30),
+            month_histogram(parts["month"]),
+            Histogram.from_values(years_to_unicorn, bins=30),
+        )
+
+    _, results["histograms"] = measure(histograms)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, directory=None, seed=0, trace_memory=True):
+    """Benchmark every size; returns ``{str(size): {stage: metrics}}``."""
+    with tempfile.TemporaryDirectory() as scratch:
+        directory = scratch if directory is None else directory
+        return {
+            str(size): benchmark_size(size, directory, seed, trace_memory)
+            for size in sizes
+        }
+
+
+def compare(results, baseline, tolerance=0.25, min_seconds=0.05):
+    """List ``(size, stage, metric, baseline, current)`` regressions beyond ``tolerance``.
+
+    Stages faster than ``min_seconds`` in the baseline are too noisy to judge
+    on wall time and only have their memory compared.
+    """
+    regressions = []
+    for size, stages in results.items():
+        for stage, metrics in stages.items():
+            reference = baseline.get(size, {}).get(stage)
+            if reference is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                if metric == "seconds" and reference[metric] < min_seconds:
+                    continue
+                if metric == "peak_bytes" and not (reference[metric] and metrics[metric]):
+                    continue
+                if metrics[metric] > reference[metric] * (1 + tolerance):
+                    regressions.append((size, stage, metric, reference[metric], metrics[metric]))
+    return regressions
+
+
+def _format(results):
+    lines = [f"{'rows':>10} {'stage':<11} {'seconds':>9} {'cpu':>9} {'peak MiB':>9}"]
+    for size, stages in results.items():
+        for stage, m in stages.items():
+            lines.append(
+                f"{size:>10} {stage:<11} {m['seconds']:9.4f} {m['cpu_seconds']:9.4f} "
+                f"{m['peak_bytes'] / 2**20:9.1f}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--data-dir", help="keep the synthetic CSVs here between runs")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--save-baseline", help="write this run's results to this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the traced second run of each stage")
+    args = parser.parse_args(argv)
+    configure_from_env()
+
+    results = run_benchmarks(args.sizes, args.data_dir, trace_memory=not args.no_memory)
+    print(_format(results))
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=1))
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline, args.tolerance)
+        for size, stage, metric, before, after in regressions:
+            print(f"REGRESSION {size} rows {stage} {metric}: {before:.4g} -> {after:.4g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
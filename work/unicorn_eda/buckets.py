@@ -0,0 +1,208 @@
+"""Integer time buckets for grouping dates by year, quarter, month, week or N days.
+
+Grouping on formatted strings (``strftime('%Y-W%V')``, ``to_period('Q')``)
+hashes one string per row and sorts the result alphabetically.
+:class:`TimeBuckets` instead maps a ``datetime64`` array to consecutive
+integer bucket ids, groups with ``bincount`` and only formats a label for
+each bucket that appears in the output::
+
+    weeks = TimeBuckets("week")
+    weeks.count(companies["Date Joined"])                 # companies per ISO week
+    TimeBuckets("quarter").aggregate(companies["Date Joined"], companies["Valuation"], "mean")
+    TimeBuckets("14D", origin="2021-01-04").count(companies["Date Joined"])
+
+Bucket ids increase with time and neighbouring buckets have neighbouring ids,
+so results come out in calendar order and empty buckets can be filled in.
+Ids are counted from 0001-01-01 (a Monday), so they are non-negative for any
+date a ``datetime64[ns]`` can hold; missing dates get ``-1``.
+
+Labels: ``2021`` (year), ``2021-Q3`` (quarter), ``2021-07`` (month),
+``2021-W05`` (ISO week, numbered within its ISO year) and the first day
+(``2021-01-04``) for N-day windows.
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .dates import date_parts
+from .instrument import instrumented
+
+
+FREQUENCIES = ("year", "quarter", "month", "week")
+AGGREGATIONS = ("count", "sum", "mean", "min", "max")
+
+# Days from 0001-01-01 (a Monday in the proleptic Gregorian calendar) to 1970-01-01.
+_EPOCH_DAYS = 719_162
+_DAYS_PATTERN = re.compile(r"^(\d+)[dD]$")
+
+
+class TimeBuckets:
+    """Maps dates to integer bucket ids and labels for one bucket frequency.
+
+    ``freq`` is one of :data:`FREQUENCIES` or ``"<n>D"`` for windows of ``n``
+    days aligned so that one window starts at ``origin``.
+    """
+
+    def __init__(self, freq="month", origin="1970-01-01"):
+        match = _DAYS_PATTERN.match(freq)
+        if match:
+            self.days = int(match.group(1))
+            if self.days < 1:
+                raise ValueError("day windows must be at least one day long")
+            origin = np.datetime64(origin, "D").astype(np.int64) + _EPOCH_DAYS
+            self._shift = int(origin % self.days)
+        elif freq in FREQUENCIES:
+            self.days = None
+        else:
+            raise ValueError(f"unknown frequency {freq!r}; use one of {FREQUENCIES} or '<n>D'")
+        self.freq = freq
+
+    def __repr__(self):
+        return f"TimeBuckets({self.freq!r})"
+
+    @instrumented("bucket")
+    def ids(self, dates):
+        """Bucket id of every date (``int64``, ``-1`` for NaT)."""
+        dates = np.asarray(dates, dtype="datetime64[ns]")
+        missing = np.isnat(dates)
+        if self.freq in ("year", "quarter", "month"):
+            months = dates.astype("datetime64[M]").astype(np.int64) + 1970 * 12
+            ids = {"year": months // 12, "quarter": months // 3, "month": months}[self.freq]
+        else:
+            days = dates.astype("datetime64[D]").astype(np.int64) + _EPOCH_DAYS
+            if self.days is None:
+                ids = days // 7
+            else:
+                ids = (days - self._shift) // self.days
+        if missing.any():
+            ids[missing] = -1
+        return ids
+
+    def ids_from_parts(self, parts):
+        """Bucket ids from :func:`~unicorn_eda.dates.date_parts` output.
+
+        Lets callers that already split the dates into calendar parts bucket
+        them without converting the dates again; same ids as :meth:`ids`.
+        """
+        missing = parts["year"] < 0
+        if self.freq in ("year", "quarter", "month"):
+            year = parts["year"].astype(np.int64)
+            if self.freq == "year":
+                ids = year
+            elif self.freq == "quarter":
+                ids = year * 4 + parts["quarter"] - 1
+            else:
+                ids = year * 12 + parts["month"] - 1
+        else:
+            days = parts["epoch_day"] + _EPOCH_DAYS
+            if self.days is None:
+                ids = days // 7
+            else:
+                ids = (days - self._shift) // self.days
+        if missing.any():
+            ids[missing] = -1
+        return ids
+
+    def starts(self, ids):
+        """First day of each bucket as ``datetime64[D]``."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.freq in ("year", "quarter", "month"):
+            months = ids * {"year": 12, "quarter": 3, "month": 1}[self.freq] - 1970 * 12
+            return months.astype("datetime64[M]").astype("datetime64[D]")
+        if self.days is None:
+            days = ids * 7
+        else:
+            days = ids * self.days + self._shift
+        return (days - _EPOCH_DAYS).astype("datetime64[D]")
+
+    def labels(self, ids):
+        """Display label of each bucket id, as a list of strings."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.freq == "year":
+            return [str(i) for i in ids]
+        if self.freq == "quarter":
+            return [f"{i // 4}-Q{i % 4 + 1}" for i in ids]
+        if self.freq == "month":
+            return [f"{i // 12}-{i % 12 + 1:02d}" for i in ids]
+        if self.days is None:
+            parts = date_parts(self.starts(ids))
+            return [f"{y}-W{w:02d}" for y, w in zip(parts["iso_year"], parts["iso_week"])]
+        return [str(day) for day in self.starts(ids)]
+
+    def _span(self, ids, empty):
+        """Bucket ids to report: every id in range (``empty``) or only those present."""
+        valid = ids[ids >= 0]
+        if len(valid) == 0:
+            return np.zeros(0, dtype=np.int64), 0
+        low = int(valid.min())
+        if empty:
+            return np.arange(low, int(valid.max()) + 1), low
+        return np.unique(valid), low
+
+    def categorical(self, dates, empty=True):
+        """Ordered categorical of bucket labels, in calendar order.
+
+        With ``empty`` every bucket between the first and last date becomes a
+        category, so empty periods still show up in counts and plots.
+        """
+        return self.categorical_from_ids(self.ids(dates), empty)
+
+    def categorical_from_ids(self, ids, empty=True):
+        """:meth:`categorical` for bucket ids already computed."""
+        span, low = self._span(ids, empty)
+        if empty:
+            codes = np.where(ids >= 0, ids - low, -1)
+        else:
+            codes = np.where(ids >= 0, np.searchsorted(span, ids), -1)
+        return pd.Categorical.from_codes(codes, self.labels(span), ordered=True)
+
+    def count(self, dates, empty=False):
+        """Number of dates in each bucket, indexed by label in calendar order."""
+        return self.aggregate(dates, None, "count", empty)
+
+    def aggregate(self, dates, values, how="sum", empty=False):
+        """Aggregate ``values`` by the bucket of the matching ``dates``.
+
+        ``how`` is one of :data:`AGGREGATIONS`; missing values are skipped
+        like ``groupby`` (a bucket whose values are all missing counts 0, sums
+        to 0 and has NaN mean/min/max).  Buckets are labelled and ordered by
+        calendar; with ``empty`` buckets without any date are included too.
+        """
+        if how not in AGGREGATIONS:
+            raise ValueError(f"how must be one of {AGGREGATIONS}")
+        ids = self.ids(dates)
+        name = "count" if how == "count" else getattr(values, "name", None)
+        if values is None:
+            keep = ids >= 0
+            values = np.ones(len(ids))
+        else:
+            values = np.asarray(values, dtype=np.float64)
+            keep = (ids >= 0) & ~np.isnan(values)
+        span, low = self._span(ids, empty)
+        # Positions of the kept rows' buckets within ``span``.
+        groups = ids[keep] - low if empty else np.searchsorted(span, ids[keep])
+        values = values[keep]
+        n = len(span)
+
+        counts = np.bincount(groups, minlength=n)
+        if how == "count":
+            result = counts
+        elif how in ("sum", "mean"):
+            result = np.bincount(groups, weights=values, minlength=n)
+            if how == "mean":
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    result = result / counts
+        else:
+            result = np.full(n, np.nan)
+            reduce = np.fmin if how == "min" else np.fmax
+            reduce.at(result, groups, values)
+        return pd.Series(result, index=pd.Index(self.labels(span)), name=name)
+
+
+def bucket_ids(dates, freq="month", origin="1970-01-01"):
+    """Shortcut for ``TimeBuckets(freq, origin).ids(dates)``."""
+    return TimeBuckets(freq, origin).ids(dates)
@@ -0,0 +1,229 @@
+"""Pre-aggregated cube of valuation and funding metrics.
+
+:class:`AggregateCube` groups the companies table once by every dimension in
+:data:`CUBE_DIMENSIONS` and stores, for each non-empty cell, the number of
+companies and the count/sum/min/max of each measure.  Slices and roll-ups are
+then answered from the cells (a few thousand rows of integer codes) instead
+of rescanning the companies table.  The cell-to-group mapping of each
+roll-up is computed on first use and kept, so a repeated query only masks
+and reduces the cells, e.g.::
+
+    cube.query(by="Industry").nlargest(5, ("Valuation", "sum"))
+    cube.query(by="Industry", where={"Year Joined": 2015})
+    cube.query(by=["Year Joined", "Quarter"], where={"Year Joined": [2020, 2021]})
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .dates import date_parts
+from .instrument import instrumented
+
+
+CUBE_DIMENSIONS = ("Industry", "Continent", "Country/Region", "Year Joined", "Quarter", "Month")
+CUBE_MEASURES = ("Valuation", "Funding")
+STATISTICS = ("count", "sum", "min", "max")
+
+
+def _group_reduce(groups, n_groups, counts, sums, mins, maxs):
+    """Combine per-row partial aggregates into ``n_groups`` groups."""
+    order = np.argsort(groups, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(groups[order]) != 0])
+    return (
+        np.bincount(groups, weights=counts, minlength=n_groups).astype(np.int64),
+        np.bincount(groups, weights=sums, minlength=n_groups),
+        np.fmin.reduceat(mins[order], starts),
+        np.fmax.reduceat(maxs[order], starts),
+    )
+
+
+def _group_labels(labels, codes):
+    """``labels[codes]`` with NaN where the code is -1 (a missing dimension value)."""
+    if not (codes < 0).any():
+        return labels.take(codes)
+    if labels.dtype.kind in "iub":
+        # Integer indexes cannot hold NaN.
+        labels = labels.astype(np.float64)
+    return labels.take(codes, allow_fill=True, fill_value=np.nan)
+
+
+class AggregateCube:
+    """Materialized count/sum/min/max cells over the cube dimensions."""
+
+    def __init__(self, codes, labels, companies, measures):
+        # codes[dim]: int array with one entry per cell; labels[dim]: pd.Index
+        # of the values those codes point to; measures[(measure, stat)]: array.
+        self.codes = codes
+        self.labels = labels
+        self.companies = companies
+        self.measures = measures
+        self._measure_names = list(dict.fromkeys(measure for measure, _ in measures))
+        self._columns = pd.MultiIndex.from_tuples(
+            [("Companies", "count")]
+            + [(measure, stat) for measure in self._measure_names for stat in (*STATISTICS, "mean")]
+        )
+        # by tuple -> (group of every cell, cells sorted by group, group index,
+        # group labels per dimension as NumPy arrays).
+        self._rollups = {}
+
+    def __len__(self):
+        return len(self.companies)
+
+    @classmethod
+    @instrumented("build_cube")
+    def from_frame(cls, frame, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        """Build the cube from a structured companies frame."""
+        parts = None
+        row_codes, labels = [], {}
+        for dim in dimensions:
+            if dim in frame:
+                values = frame[dim]
+            else:
+                if parts is None:
+                    parts = date_parts(frame["Date Joined"].to_numpy())
+                values = {"Year Joined": parts["year"], "Quarter": parts["quarter"], "Month": parts["month"]}[dim]
+                # date_parts marks NaT with -1; make it missing, not a "-1" label.
+                if (values < 0).any():
+                    values = np.where(values >= 0, values, np.nan)
+            codes, uniques = pd.factorize(values, sort=True)
+            row_codes.append(codes)
+            labels[dim] = pd.Index(uniques, name=dim)
+
+        # Missing dimension values (code -1) get their own trailing code so the
+        # rows still count towards roll-ups over other dimensions.
+        shape = [len(labels[dim]) + 1 for dim in dimensions]
+        keys = np.ravel_multi_index([np.where(c < 0, s - 1, c) for c, s in zip(row_codes, shape)], shape)
+        cells, inverse = np.unique(keys, return_inverse=True)
+        inverse = inverse.ravel()
+        cell_codes = np.unravel_index(cells, shape)
+        codes = {
+            dim: np.where(c == s - 1, -1, c).astype(np.int32)
+            for dim, c, s in zip(dimensions, cell_codes, shape)
+        }
+
+        ones = np.ones(len(frame))
+        companies = np.bincount(inverse, minlength=len(cells)).astype(np.int64)
+        cube_measures = {}
+        for measure in measures:
+            values = frame[measure].to_numpy(dtype=np.float64)
+            present = ~np.isnan(values)
+            reduced = _group_reduce(
+                inverse, len(cells), ones * present, np.where(present, values, 0.0), values, values
+            )
+            for stat, array in zip(STATISTICS, reduced):
+                cube_measures[(measure, stat)] = array
+        return cls(codes, labels, companies, cube_measures)
+
+    def _mask(self, where):
+        mask = np.ones(len(self), dtype=bool)
+        for dim, wanted in (where or {}).items():
+            if np.ndim(wanted) == 0:
+                wanted = [wanted]
+            labels = self.labels[dim]
+            # Lookup table over the codes; the trailing False is for code -1.
+            accepted = np.zeros(len(labels) + 1, dtype=bool)
+            for value in wanted:
+                try:
+                    accepted[labels.get_loc(value)] = True
+                except (KeyError, TypeError):
+                    pass
+            mask &= accepted[self.codes[dim]]
+        return mask
+
+    def _rollup(self, by):
+        """Group of every cell when rolling up to ``by``, computed once per ``by``."""
+        key = tuple(by)
+        if key in self._rollups:
+            return self._rollups[key]
+        if by:
+            shape = [len(self.labels[dim]) + 1 for dim in by]
+            keys = np.ravel_multi_index(
+                [np.where(self.codes[dim] < 0, s - 1, self.codes[dim]) for dim, s in zip(by, shape)],
+                shape,
+            )
+            groups, inverse = np.unique(keys, return_inverse=True)
+            inverse = inverse.ravel()
+            group_codes = np.unravel_index(groups, shape)
+            index_parts = [
+                _group_labels(self.labels[dim], np.where(c == s - 1, -1, c))
+                for dim, c, s in zip(by, group_codes, shape)
+            ]
+            index = pd.MultiIndex.from_arrays(index_parts, names=by) if len(by) > 1 else index_parts[0].rename(by[0])
+        else:
+            inverse = np.zeros(len(self), dtype=np.int64)
+            index = pd.RangeIndex(1)
+        labels = {
+            dim: (index.get_level_values(dim) if len(by) > 1 else index).to_numpy()
+            for dim in by
+        }
+        rollup = (inverse, np.argsort(inverse, kind="stable"), index, labels)
+        self._rollups[key] = rollup
+        return rollup
+
+    def _aggregate(self, by, where):
+        """Positions of the non-empty groups in the roll-up index, and the result columns."""
+        inverse, order = self._rollup(by)[:2]
+        cells = order[self._mask(where)[order]] if where else order
+        groups = inverse[cells]
+        starts = np.flatnonzero(np.concatenate(([True], groups[1:] != groups[:-1]))) if len(cells) else cells
+
+        def reduce(ufunc, values):
+            if not len(cells):
+                return np.zeros(0, dtype=values.dtype)
+            return ufunc.reduceat(values[cells], starts)
+
+        columns = [reduce(np.add, self.companies)]
+        for measure in self._measure_names:
+            count = reduce(np.add, self.measures[(measure, "count")])
+            total = reduce(np.add, self.measures[(measure, "sum")])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                columns += [
+                    count,
+                    total,
+                    reduce(np.fmin, self.measures[(measure, "min")]),
+                    reduce(np.fmax, self.measures[(measure, "max")]),
+                    total / count,
+                ]
+        return groups[starts], columns
+
+    @staticmethod
+    def _by(by):
+        return [by] if isinstance(by, str) else list(by)
+
+    @instrumented("aggregate")
+    def query(self, by=(), where=None):
+        """Roll the cube up to the ``by`` dimensions after slicing on ``where``.
+
+        ``where`` maps a dimension to one value or a list of accepted values.
+        Returns a frame indexed by the ``by`` labels with a ``("Companies",
+        "count")`` column and ``(measure, stat)`` columns for count, sum, min,
+        max and mean.
+        """
+        by = self._by(by)
+        present, columns = self._aggregate(by, where)
+        index = self._rollup(by)[2]
+        index = index[:len(present)] if not by else index.take(present)
+        # Building the column MultiIndex is the expensive part of a small
+        # DataFrame, so the one made in __init__ is reused.
+        result = pd.DataFrame(dict(enumerate(columns)), index=index, copy=False)
+        result.columns = self._columns
+        return result
+
+    def query_arrays(self, by=(), where=None):
+        """:meth:`query` as plain arrays, without building a DataFrame.
+
+        Returns ``(labels, columns)``: ``labels`` maps each ``by`` dimension to
+        the group values and ``columns`` maps each column of :meth:`query`
+        (``("Companies", "count")``, ``(measure, stat)``) to an array, in the
+        same row order.
+        """
+        by = self._by(by)
+        present, columns = self._aggregate(by, where)
+        labels = {dim: values[present] for dim, values in self._rollup(by)[3].items()}
+        return labels, dict(zip(self._columns, columns))
+
+    def top(self, n, by, column=("Valuation", "sum"), where=None):
+        """The ``n`` groups of ``by`` with the largest ``column``."""
+        return self.query(by, where).nlargest(n, column)
@@ -0,0 +1,96 @@
+"""Explicit-format parsing of ``Date Joined`` and calendar parts derived from it.
+
+Dates such as ``4/7/17`` repeat heavily (a few hundred distinct strings for
+thousands of rows), so parsing goes through a memo of unique strings: each
+distinct string is parsed once with a known format and rows are filled in by
+integer lookup.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .instrument import instrumented
+
+
+DATE_FORMAT = "%m/%d/%y"
+
+_NAT = np.datetime64("NaT", "ns")
+
+
+class DateMemo:
+    """Parse date strings with a fixed format, remembering every distinct string.
+
+    One memo can be reused across calls (chunks of one file, or several daily
+    snapshots) so a string already seen is never parsed again.
+    """
+
+    def __init__(self, format=DATE_FORMAT):
+        self.format = format
+        self._parsed = {}
+
+    def __len__(self):
+        return len(self._parsed)
+
+    @instrumented("parse_dates")
+    def parse(self, values):
+        """Return ``values`` as a ``datetime64[ns]`` array; missing values become NaT."""
+        codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+        unseen = [value for value in uniques if value not in self._parsed]
+        if unseen:
+            parsed = pd.to_datetime(pd.Index(unseen, dtype=object), format=self.format)
+            self._parsed.update(zip(unseen, parsed.to_numpy(dtype="datetime64[ns]")))
+
+        # The trailing NaT is picked up by the -1 code pandas uses for missing values.
+        lookup = np.empty(len(uniques) + 1, dtype="datetime64[ns]")
+        lookup[:-1] = [self._parsed[value] for value in uniques]
+        lookup[-1] = _NAT
+        return lookup[codes]
+
+
+def parse_dates(values, format=DATE_FORMAT, memo=None):
+    """Parse date strings with an explicit ``format`` through a :class:`DateMemo`."""
+    if memo is None:
+        memo = DateMemo(format)
+    return memo.parse(values)
+
+
+def date_parts(dates):
+    """Derive calendar parts from one ``datetime64`` array.
+
+    Returns a dict with ``year``, ``month``, ``quarter``, ``iso_year``,
+    ``iso_week`` and ``epoch_day`` (days since 1970-01-01) arrays, all computed
+    from a single conversion to day numbers.  NaT rows get ``-1`` in every
+    part; since ``-1`` is also a valid ``epoch_day``, test ``year`` for them.
+    """
+    dates = np.asarray(dates, dtype="datetime64[ns]")
+    missing = np.isnat(dates)
+    day_dates = dates.astype("datetime64[D]")
+    days = day_dates.astype(np.int64)
+
+    months_since_epoch = day_dates.astype("datetime64[M]").astype(np.int64)
+    year = months_since_epoch // 12 + 1970
+    month = months_since_epoch % 12 + 1
+    quarter = (month - 1) // 3 + 1
+
+    # ISO weeks belong to the year of their Thursday.  1970-01-01 was a
+    # Thursday, so (days + 3) % 7 is the weekday with Monday == 0.
+    weekday = (days + 3) % 7
+    thursday = day_dates - weekday + 3
+    iso_year = thursday.astype("datetime64[Y]").astype(np.int64) + 1970
+    iso_year_start = (iso_year - 1970).astype("datetime64[Y]").astype("datetime64[D]")
+    iso_week = (thursday - iso_year_start).astype(np.int64) // 7 + 1
+
+    parts = {
+        "year": year.astype(np.int32),
+        "month": month.astype(np.int8),
+        "quarter": quarter.astype(np.int8),
+        "iso_year": iso_year.astype(np.int32),
+        "iso_week": iso_week.astype(np.int8),
+        "epoch_day": days,
+    }
+    if missing.any():
+        for values in parts.values():
+            values[missing] = -1
+    return parts
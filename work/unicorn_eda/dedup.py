@@ -0,0 +1,107 @@
+"""Streaming duplicate detection with 64-bit row fingerprints.
+
+Instead of comparing whole rows (including the long ``Select Investors``
+strings) the way ``DataFrame.drop_duplicates`` does, every row -- or just a
+key such as ``["Company", "Date Joined"]`` -- is hashed to one ``uint64``.
+A :class:`Deduplicator` keeps the fingerprints it has already seen in
+sorted arrays, so it can be fed chunk after chunk and file after file, and
+saved between daily runs.
+
+The seen set is a log-structured merge of sorted runs: each chunk's new
+fingerprints become a run of their own, and neighbouring runs are merged
+whenever the older one is at most twice the size of the newer.  There are
+``O(log n)`` runs, looked up with ``searchsorted``, and every fingerprint is
+re-merged ``O(log n)`` times, so the cost of a chunk depends on its own
+size rather than on everything seen before it.
+
+Fingerprints are computed from column values, so feed a deduplicator frames
+from the same stage (all raw, or all structured) for the hashes to agree.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .instrument import instrumented
+
+
+def fingerprint(frame, subset=None):
+    """Return one ``uint64`` fingerprint per row of ``frame`` (over ``subset`` columns)."""
+    if subset is not None:
+        frame = frame[list(subset)]
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+class Deduplicator:
+    """Remember row fingerprints across chunks and snapshot files."""
+
+    def __init__(self, subset=None, seen=None):
+        self.subset = None if subset is None else list(subset)
+        # Sorted, mutually disjoint runs of fingerprints, oldest (largest) first.
+        self._runs = []
+        if seen is not None and len(seen):
+            self._runs.append(np.unique(np.asarray(seen, dtype=np.uint64)))
+        self.rows_seen = 0
+        self.rows_dropped = 0
+
+    def __len__(self):
+        """Number of distinct fingerprints seen so far."""
+        return sum(len(run) for run in self._runs)
+
+    @classmethod
+    def load(cls, path, subset=None):
+        """Restore the fingerprints written by :meth:`save`; a missing file starts empty."""
+        path = Path(path)
+        if not path.exists():
+            return cls(subset)
+        return cls(subset, seen=np.load(path))
+
+    def save(self, path):
+        """Write the fingerprint set to ``path`` as a ``.npy`` file."""
+        np.save(path, self.seen())
+
+    def seen(self):
+        """All fingerprints seen so far, as one sorted ``uint64`` array."""
+        if not self._runs:
+            return np.zeros(0, dtype=np.uint64)
+        return np.sort(np.concatenate(self._runs), kind="stable")
+
+    def _known(self, unique):
+        """Which of the sorted, distinct fingerprints ``unique`` are already in a run."""
+        known = np.zeros(len(unique), dtype=bool)
+        for run in self._runs:
+            position = np.searchsorted(run, unique)
+            inside = position < len(run)
+            known[inside] |= run[position[inside]] == unique[inside]
+        return known
+
+    def _add_run(self, run):
+        """Add the sorted fingerprints ``run`` (none seen before) as a new run."""
+        if not len(run):
+            return
+        self._runs.append(run)
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            newer = self._runs.pop()
+            # Timsort merges the two sorted halves in linear time.
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], newer]), kind="stable")
+
+    def keep_mask(self, frame):
+        """Boolean mask of the rows of ``frame`` not seen before (in this or earlier frames)."""
+        hashes = fingerprint(frame, self.subset)
+        unique, first = np.unique(hashes, return_index=True)
+        known = self._known(unique)
+
+        keep = np.zeros(len(hashes), dtype=bool)
+        keep[first[~known]] = True
+        self._add_run(unique[~known])
+        self.rows_seen += len(hashes)
+        self.rows_dropped += len(hashes) - int(keep.sum())
+        return keep
+
+    @instrumented("drop_duplicates")
+    def drop_duplicates(self, frame):
+        """Return ``frame`` without the rows already seen (first occurrence wins)."""
+        return frame[self.keep_mask(frame)]
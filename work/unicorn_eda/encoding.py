@@ -0,0 +1,76 @@
+"""Stable dictionary encoding for the low-cardinality text columns.
+
+``Industry``, ``City``, ``Country/Region`` and ``Continent`` repeat a few
+hundred distinct strings across thousands of rows.  Storing them as pandas
+categoricals means ``value_counts``, ``mode`` and ``groupby`` work on integer
+codes instead of hashing strings again.
+
+A :class:`CategoryDictionary` only ever appends new values, so a code keeps
+its meaning across snapshots encoded with the same (persisted) dictionary.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from .atomic import atomic_path
+
+
+CATEGORICAL_COLUMNS = ("Industry", "City", "Country/Region", "Continent")
+
+
+class CategoryDictionary:
+    """Append-only mapping of column name -> list of category values."""
+
+    def __init__(self, categories=None):
+        self.categories = {
+            column: list(values) for column, values in (categories or {}).items()
+        }
+        self._known = {
+            column: set(values) for column, values in self.categories.items()
+        }
+        self.changed = False
+
+    @classmethod
+    def load(cls, path):
+        """Read a dictionary saved with :meth:`save`; a missing file gives an empty one."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, encoding="utf-8") as handle:
+            return cls(json.load(handle))
+
+    def save(self, path):
+        """Write the dictionary to ``path`` as JSON (atomically)."""
+        with atomic_path(path) as tmp, open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(self.categories, handle, ensure_ascii=False, indent=1)
+        self.changed = False
+
+    def update(self, column, values):
+        """Append values of ``column`` not seen before and return its categories.
+
+        New values are appended in sorted order so that encoding the same data
+        always produces the same dictionary.
+        """
+        categories = self.categories.setdefault(column, [])
+        known = self._known.setdefault(column, set())
+        unseen = sorted(
+            value for value in pd.unique(pd.Series(values).dropna()) if value not in known
+        )
+        if unseen:
+            categories.extend(unseen)
+            known.update(unseen)
+            self.changed = True
+        return categories
+
+    def dtype(self, column):
+        """Return the ``CategoricalDtype`` currently used for ``column``."""
+        return pd.CategoricalDtype(self.categories.get(column, []))
+
+    def encode(self, column, values):
+        """Return ``values`` as a categorical whose codes follow this dictionary."""
+        self.update(column, values)
+        return pd.Categorical(values, dtype=self.dtype(column))
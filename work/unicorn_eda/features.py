@@ -0,0 +1,132 @@
+"""Registry of derived columns shared by the script and the notebooks.
+
+Each derived column is declared once with the function that computes it.
+:func:`derive` evaluates any set of registered columns in one pass: calendar
+parts of a date column are computed a single time and shared by every feature
+that needs them, and results are attached to the frame without copying the
+existing columns.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .buckets import TimeBuckets
+from .dates import date_parts
+from .instrument import instrumented
+
+
+MONTH_ABBREVIATIONS = [
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+]
+
+MONTH_DTYPE = pd.CategoricalDtype(MONTH_ABBREVIATIONS, ordered=True)
+
+# Derived column name -> function(context) returning the column values.
+FEATURES = {}
+
+# Derived column name -> source columns it is computed from.
+FEATURE_SOURCES = {}
+
+
+def feature(name, *aliases, sources=("Date Joined",)):
+    """Register the decorated function as the definition of ``name``."""
+    def register(compute):
+        for key in (name, *aliases):
+            FEATURES[key] = compute
+            FEATURE_SOURCES[key] = tuple(sources)
+        return compute
+    return register
+
+
+class _Context:
+    """Per-call state shared by the feature functions of one :func:`derive` call."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self._parts = {}
+
+    def parts(self, column="Date Joined"):
+        if column not in self._parts:
+            self._parts[column] = date_parts(self.frame[column].to_numpy())
+        return self._parts[column]
+
+
+def _masked(values, missing):
+    """``values`` with the ``missing`` rows set to NaN, like ``Series.dt.year`` on NaT.
+
+    The integer array is returned unchanged when nothing is missing.
+    """
+    if not missing.any():
+        return values
+    values = values.astype(np.float64)
+    values[missing] = np.nan
+    return values
+
+
+@feature("Year Joined")
+def _year_joined(ctx):
+    year = ctx.parts()["year"]
+    return _masked(year, year < 0)
+
+
+@feature("Month Number Joined")
+def _month_number_joined(ctx):
+    month = ctx.parts()["month"]
+    return _masked(month, month < 0)
+
+
+@feature("Month Joined")
+def _month_joined(ctx):
+    # Stored as an ordered categorical so sorting and plotting follow the
+    # calendar rather than the alphabet.
+    month = ctx.parts()["month"]
+    return pd.Categorical.from_codes(np.where(month > 0, month - 1, -1), dtype=MONTH_DTYPE)
+
+
+def _bucket_categorical(ctx, freq):
+    buckets = TimeBuckets(freq)
+    return buckets.categorical_from_ids(buckets.ids_from_parts(ctx.parts()))
+
+
+@feature("Quarter Joined")
+def _quarter_joined(ctx):
+    return _bucket_categorical(ctx, "quarter")
+
+
+@feature("Week Joined")
+def _week_joined(ctx):
+    # Label ISO weeks with their ISO year so the last days of December that
+    # belong to week 1 sort after week 52 of the same year.
+    return _bucket_categorical(ctx, "week")
+
+
+@feature("Years to Unicorn", "Years To Join", sources=("Date Joined", "Year Founded"))
+def _years_to_unicorn(ctx):
+    year = ctx.parts()["year"]
+    founded = ctx.frame["Year Founded"]
+    missing = (year < 0) | founded.isna().to_numpy()
+    return _masked(year - founded.fillna(0).to_numpy(dtype=np.int64), missing)
+
+
+@instrumented("derive")
+def derive(frame, names, inplace=True):
+    """Add the registered derived columns ``names`` to ``frame``.
+
+    With ``inplace=False`` the columns are added to a shallow copy, which
+    shares the existing column data with ``frame``.
+    """
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise KeyError(f"unknown derived column(s): {', '.join(unknown)}")
+
+    ctx = _Context(frame)
+    values = {name: FEATURES[name](ctx) for name in names}
+
+    if not inplace:
+        frame = frame.copy(deep=False)
+    for name, column in values.items():
+        frame[name] = column
+    return frame
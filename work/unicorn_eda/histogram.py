@@ -0,0 +1,126 @@
+"""Histogram counts computed apart from matplotlib.
+
+The columns the EDA plots (``Year Founded``, ``Month Joined``, ``Years to
+Unicorn``) are small integers, so their histograms come straight from
+``np.bincount`` (via :class:`~unicorn_eda.stats.IntCounts`); other float
+columns fall back to ``np.histogram``.  Counts can be merged across chunks
+or snapshots, cached, and re-binned into the equal-width bins
+``plt.hist(values, bins=n)`` would use, without touching the rows again.
+:meth:`Histogram.plot` only draws precomputed counts.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .features import MONTH_ABBREVIATIONS
+from .instrument import instrumented
+from .stats import IntCounts, integer_values
+
+
+class Histogram:
+    """Bin edges and counts, optionally with a label per bin."""
+
+    def __init__(self, edges, counts, labels=None):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.labels = None if labels is None else list(labels)
+
+    def __len__(self):
+        return len(self.counts)
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_int_counts(cls, int_counts, bins=None):
+        """Histogram of integer value counts.
+
+        With ``bins=None`` every integer gets its own unit-wide bin.  With an
+        integer ``bins`` the edges are the equal-width bins ``np.histogram`` /
+        ``plt.hist`` would use for the raw values.
+        """
+        present = np.flatnonzero(int_counts.counts)
+        if not len(present):
+            return cls(np.zeros(1), np.zeros(0, dtype=np.int64))
+        values = int_counts.values[present]
+        weights = int_counts.counts[present]
+        if bins is None:
+            edges = np.arange(values[0], values[-1] + 2) - 0.5
+        else:
+            edges = np.histogram_bin_edges(values, bins=bins)
+        counts, _ = np.histogram(values, bins=edges, weights=weights)
+        return cls(edges, counts.astype(np.int64))
+
+    @classmethod
+    def from_values(cls, values, bins=None):
+        """Histogram of ``values``, skipping missing ones.
+
+        Whole numbers are counted with ``np.bincount``; other values are
+        binned by ``np.histogram`` (10 bins when ``bins`` is ``None``).
+        """
+        integers = integer_values(values)
+        if integers is not None:
+            return cls.from_int_counts(IntCounts(integers), bins)
+        floats = pd.Series(values, copy=False).dropna().to_numpy(dtype=np.float64)
+        counts, edges = np.histogram(floats, bins=10 if bins is None else bins)
+        return cls(edges, counts)
+
+    def merge(self, other):
+        """Add the counts of a histogram with identical edges."""
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("histograms with different bin edges cannot be merged")
+        self.counts = self.counts + other.counts
+        return self
+
+    @instrumented("plot")
+    def plot(self, ax=None, **kwargs):
+        """Draw the precomputed counts on ``ax`` (the current axes by default)."""
+        if ax is None:
+            import matplotlib.pyplot as plt
+
+            ax = plt.gca()
+        if self.labels is not None:
+            return ax.bar(self.labels, self.counts, **kwargs)
+        # Each left edge falls in its own bin, so weighting the edges by the
+        # counts reproduces the plt.hist drawing of the raw values.
+        return ax.hist(self.edges[:-1], bins=self.edges, weights=self.counts, **kwargs)
+
+
+def month_histogram(months):
+    """Twelve-bin histogram of month numbers (1-12), labelled Jan..Dec in calendar order."""
+    months = np.asarray(months, dtype=np.float64)
+    months = months[(months >= 1) & (months <= 12)].astype(np.int64)
+    counts = np.bincount(months, minlength=13)[1:]
+    return Histogram(np.arange(13) + 0.5, counts, labels=MONTH_ABBREVIATIONS)
+
+
+class HistogramCache:
+    """Size-bounded LRU cache of histograms keyed by ``(data key, column, bins)``.
+
+    The data key is whatever identifies the dataset version, such as
+    :func:`unicorn_eda.loader.file_digest` of the source CSV.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, data_key, column, bins, compute):
+        """Return the cached histogram, calling ``compute()`` on a miss."""
+        key = (data_key, column, bins)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        histogram = compute()
+        self._entries[key] = histogram
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return histogram
@@ -0,0 +1,175 @@
+"""Valuation history across stacked snapshots via sorted merges.
+
+:func:`~unicorn_eda.ingest.ingest_snapshots` stacks daily snapshots into one
+frame with a ``Snapshot`` column.  Following each company's valuation over
+time with ``pd.concat`` plus a self-merge on ``Company`` pairs every
+observation with every other one of the same company, which grows
+quadratically with the number of snapshots.  Here the rows are instead
+sorted once by ``(company, snapshot date)``; every row's previous
+observation is then simply the row before it in the same company run::
+
+    snapshots = ingest_snapshots("snapshots/")
+    snapshots["Snapshot Date"] = snapshot_dates(snapshots["Snapshot"])
+    history = valuation_history(snapshots)
+    history[history["Revalued"]]
+
+:func:`asof_join` generalises this to two tables: for each left row it finds
+the latest right row of the same key at or before the left row's time, with
+one stable sort of both tables together instead of a merge.
+
+Both are ``O(n log n)`` in the number of rows and allocate a fixed number of
+columns; nothing scales with the number of snapshots per company.
+"""
+
+from __future__ import annotations
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from .instrument import instrumented
+
+
+SNAPSHOT_DATE_COLUMN = "Snapshot Date"
+
+_NS_PER_DAY = 86_400 * 10**9
+_DATE_IN_NAME = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})")
+
+
+def snapshot_dates(snapshots):
+    """Dates encoded in snapshot names (``2022-03-01`` or ``20220301`` anywhere in them).
+
+    Each distinct name is parsed once; names without a date give NaT.
+    """
+    snapshots = pd.Series(snapshots, copy=False).astype("category")
+    parsed = []
+    for name in snapshots.cat.categories:
+        match = _DATE_IN_NAME.search(str(name))
+        parsed.append("-".join(match.groups()) if match else "NaT")
+    dates = np.array(parsed, dtype="datetime64[ns]")
+    codes = snapshots.cat.codes.to_numpy()
+    return np.where(codes >= 0, dates[codes], np.datetime64("NaT", "ns"))
+
+
+def _key_codes(*keys):
+    """Factorize ``keys`` (arrays of the same values) against one shared, sorted table."""
+    lengths = [len(key) for key in keys]
+    codes, _ = pd.factorize(
+        pd.concat([pd.Series(key, copy=False) for key in keys], ignore_index=True), sort=True
+    )
+    return np.split(codes, np.cumsum(lengths)[:-1])
+
+
+@instrumented("valuation_history")
+def valuation_history(frame, key="Company", time=SNAPSHOT_DATE_COLUMN, value="Valuation",
+                      joined="Date Joined"):
+    """Per-company valuation trajectory, one row per (``key``, ``time``) observation.
+
+    Rows are returned sorted by key then time (the original row labels are
+    kept as the index).  When a company appears twice at the same time the
+    later row wins.  Added columns:
+
+    * ``Previous Valuation`` / ``Valuation Change`` / ``Growth Rate``: against
+      the company's previous observation (NaN for its first one);
+    * ``Days Since Previous``: days between the two observations;
+    * ``Days Since Joined``: days from ``joined`` to this observation;
+    * ``Total Growth``: growth since the company's first observation;
+    * ``Revalued``: the valuation differs from the previous observation
+      (False when either one is missing).
+    """
+    codes = _key_codes(frame[key])[0]
+    times = np.asarray(frame[time], dtype="datetime64[ns]").view(np.int64)
+    order = np.lexsort((np.arange(len(frame)), times, codes))
+    codes, times = codes[order], times[order]
+
+    # Keep the last row of each (key, time) pair.
+    last = np.r_[(codes[1:] != codes[:-1]) | (times[1:] != times[:-1]), True]
+    order, codes, times = order[last], codes[last], times[last]
+    result = frame.iloc[order]
+
+    values = np.asarray(result[value], dtype=np.float64)
+    first = np.r_[True, codes[1:] != codes[:-1]]
+    previous = np.r_[np.nan, values[:-1]]
+    previous[first] = np.nan
+    previous_time = np.r_[0, times[:-1]]
+    start = np.maximum.accumulate(np.where(first, np.arange(len(values)), 0))
+
+    result = result.copy(deep=False)
+    result[f"Previous {value}"] = previous
+    result[f"{value} Change"] = values - previous
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result["Growth Rate"] = values / previous - 1
+        result["Total Growth"] = values / values[start] - 1
+    result["Days Since Previous"] = np.where(first, np.nan, (times - previous_time) / _NS_PER_DAY)
+    if joined in result:
+        joined_times = np.asarray(result[joined], dtype="datetime64[ns]")
+        result["Days Since Joined"] = (
+            (times.view("datetime64[ns]") - joined_times) / np.timedelta64(1, "D")
+        )
+    result["Revalued"] = ~first & (values != previous) & ~np.isnan(values) & ~np.isnan(previous)
+    return result
+
+
+def asof_positions(left_keys, left_times, right_keys, right_times, allow_exact_matches=True):
+    """Position of the latest right row with the same key at or before each left row.
+
+    Keys must already be integer codes shared by both sides (see
+    :func:`asof_join`); returns ``-1`` where the left row has no match.  With
+    ``allow_exact_matches=False`` the right row must be strictly earlier.
+    """
+    n_left, n_right = len(left_keys), len(right_keys)
+    keys = np.concatenate([left_keys, right_keys])
+    times = np.concatenate([
+        np.asarray(left_times, dtype="datetime64[ns]").view(np.int64),
+        np.asarray(right_times, dtype="datetime64[ns]").view(np.int64),
+    ])
+    # On equal (key, time) right rows sort before left rows when exact matches
+    # count, after them otherwise.
+    side = np.r_[np.ones(n_left, np.int8), np.zeros(n_right, np.int8)]
+    if not allow_exact_matches:
+        side = 1 - side
+    order = np.lexsort((side, times, keys))
+
+    is_right = order >= n_left
+    # Latest right row seen so far in sorted order, reset at every key change.
+    seen = np.where(is_right, np.arange(len(order)), -1)
+    seen = np.maximum.accumulate(seen)
+    key_start = np.r_[True, keys[order][1:] != keys[order][:-1]]
+    group_start = np.maximum.accumulate(np.where(key_start, np.arange(len(order)), 0))
+    matched = np.where(seen >= group_start, order[np.maximum(seen, 0)] - n_left, -1)
+
+    positions = np.full(n_left, -1, dtype=np.int64)
+    left = ~is_right
+    positions[order[left]] = matched[left]
+    return positions
+
+
+@instrumented("asof_join")
+def asof_join(left, right, on=SNAPSHOT_DATE_COLUMN, by="Company", right_on=None,
+              allow_exact_matches=True, suffix="_asof"):
+    """Attach to each ``left`` row the latest ``right`` row of the same ``by`` key.
+
+    ``right`` rows qualify when their ``right_on`` time (``on`` by default)
+    is at or before the left row's ``on`` time; among several right rows at
+    that same latest time the last one wins.  Left rows keep their order
+    and index; right columns that clash with left ones get ``suffix``, and
+    unmatched left rows get missing values.  A ``Matched Position`` column
+    holds the matched right row number (``-1`` when none).
+    """
+    right_on = on if right_on is None else right_on
+    left_codes, right_codes = _key_codes(left[by], right[by])
+    positions = asof_positions(
+        left_codes, left[on], right_codes, right[right_on], allow_exact_matches
+    )
+
+    columns = [name for name in right.columns if name != by]
+    matched = right[columns].iloc[np.maximum(positions, 0)]
+    missing = positions < 0
+    if missing.any():
+        matched = matched.mask(np.repeat(missing[:, None], len(columns), axis=1))
+    matched.index = left.index
+    matched.columns = [f"{name}{suffix}" if name in left.columns else name for name in columns]
+    result = pd.concat([left, matched], axis=1)
+    result["Matched Position"] = positions
+    return result
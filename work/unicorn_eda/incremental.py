@@ -0,0 +1,227 @@
+"""Incrementally maintained versions of the script's summary statistics.
+
+:class:`IncrementalStats` keeps the ``Year Founded`` / ``Year Joined`` value
+counts, the Years to Unicorn mean, median and mode, and per-industry
+Valuation/Funding totals up to date as rows are inserted, updated or deleted.
+Years to Unicorn lives in a count tree over its (small) integer range, so
+every change and every median/mode query costs ``O(log range)`` instead of a
+recompute over the full history.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .dates import date_parts
+
+
+DEFAULT_KEY = ("Company", "Country/Region")
+
+
+class CountTree:
+    """Segment tree of integer value counts supporting k-th value and mode queries.
+
+    Each node stores the total count below it and the largest single count
+    below it (with the smallest value reaching it).  The covered range grows by
+    doubling when a value falls outside it.
+    """
+
+    def __init__(self, low=0, size=64):
+        self.low = low
+        self.size = 1 << max(int(size - 1).bit_length(), 0)
+        self._total = np.zeros(2 * self.size, dtype=np.int64)
+        self._best = np.zeros(2 * self.size, dtype=np.int64)
+        self._best_at = np.zeros(2 * self.size, dtype=np.int64)
+        self._best_at[self.size:] = np.arange(self.size)
+        self._sum = 0
+
+    def _grow(self, value):
+        counts = self._total[self.size:]
+        present = np.flatnonzero(counts)
+        low = min(value, self.low + (present[0] if len(present) else 0))
+        high = max(value, self.low + (present[-1] if len(present) else 0))
+        grown = CountTree(low, 2 * max(self.size, high - low + 1))
+        for offset in present:
+            grown.add(self.low + int(offset), int(counts[offset]))
+        self.__dict__.update(grown.__dict__)
+
+    def add(self, value, count=1):
+        """Add ``count`` (possibly negative) occurrences of ``value``."""
+        value = int(value)
+        if not self.low <= value < self.low + self.size:
+            self._grow(value)
+        node = value - self.low + self.size
+        self._total[node] += count
+        if self._total[node] < 0:
+            self._total[node] -= count
+            raise ValueError(f"count of {value} would become negative")
+        self._best[node] = self._total[node]
+        self._sum += value * count
+        node //= 2
+        while node:
+            left, right = 2 * node, 2 * node + 1
+            self._total[node] = self._total[left] + self._total[right]
+            # Ties go to the left child, i.e. the smaller value.
+            winner = left if self._best[left] >= self._best[right] else right
+            self._best[node] = self._best[winner]
+            self._best_at[node] = self._best_at[winner]
+            node //= 2
+
+    @property
+    def total(self):
+        return int(self._total[1])
+
+    def kth(self, k):
+        """The ``k``-th smallest value (0-based)."""
+        if not 0 <= k < self.total:
+            raise IndexError(k)
+        node = 1
+        while node < self.size:
+            node *= 2
+            if k >= self._total[node]:
+                k -= self._total[node]
+                node += 1
+        return self.low + node - self.size
+
+    def mean(self):
+        return self._sum / self.total if self.total else np.nan
+
+    def median(self):
+        """Median with the same midpoint rule as ``Series.median``."""
+        total = self.total
+        if not total:
+            return np.nan
+        return (self.kth((total - 1) // 2) + self.kth(total // 2)) / 2
+
+    def mode(self):
+        """Most frequent value, smallest on ties; ``None`` when empty."""
+        if not self.total:
+            return None
+        return self.low + int(self._best_at[1])
+
+
+class IncrementalStats:
+    """Summary statistics of the companies table maintained row by row.
+
+    Rows are identified by the ``key`` columns (company name and country by
+    default, since company names alone are not unique).
+    """
+
+    def __init__(self, key=DEFAULT_KEY):
+        self.key = list(key)
+        self._rows = {}
+        self.year_founded = Counter()
+        self.year_joined = Counter()
+        self.years_to_unicorn = CountTree()
+        self._industry = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    @classmethod
+    def from_frame(cls, frame, key=DEFAULT_KEY):
+        stats = cls(key)
+        stats.insert(frame)
+        return stats
+
+    def _records(self, frame):
+        joined = date_parts(frame["Date Joined"].to_numpy())["year"]
+        founded = frame["Year Founded"].to_numpy(dtype=np.float64, na_value=np.nan)
+        # -1 marks a missing year, as date_parts does for missing dates.
+        founded = np.where(np.isnan(founded), -1, founded).astype(np.int64)
+        keys = zip(*(frame[column].tolist() for column in self.key))
+        return zip(
+            keys,
+            zip(
+                founded.tolist(),
+                joined.tolist(),
+                frame["Industry"].astype(object).tolist(),
+                frame["Valuation"].tolist(),
+                frame["Funding"].tolist(),
+            ),
+        )
+
+    def _apply(self, record, sign):
+        founded, joined, industry, valuation, funding = record
+        if founded >= 0:
+            self.year_founded[founded] += sign
+            if not self.year_founded[founded]:
+                del self.year_founded[founded]
+        if joined >= 0:
+            self.year_joined[joined] += sign
+            if not self.year_joined[joined]:
+                del self.year_joined[joined]
+            if founded >= 0:
+                self.years_to_unicorn.add(joined - founded, sign)
+        totals = self._industry.setdefault(industry, [0, 0.0, 0.0])
+        totals[0] += sign
+        totals[1] += sign * (0.0 if np.isnan(valuation) else valuation)
+        totals[2] += sign * (0.0 if np.isnan(funding) else funding)
+        if not totals[0]:
+            del self._industry[industry]
+
+    def insert(self, frame):
+        """Add new rows.
+
+        Raises ``KeyError`` without changing anything if a key is already
+        present or appears twice in ``frame``.
+        """
+        records = dict(self._records(frame))
+        if len(records) < len(frame):
+            keys = list(zip(*(frame[column].tolist() for column in self.key)))
+            raise KeyError(next(key for key, count in Counter(keys).items() if count > 1))
+        for key in records:
+            if key in self._rows:
+                raise KeyError(key)
+        for key, record in records.items():
+            self._rows[key] = record
+            self._apply(record, 1)
+        return self
+
+    def upsert(self, frame):
+        """Insert new rows and replace the existing rows with the same key."""
+        for key, record in self._records(frame):
+            previous = self._rows.get(key)
+            if previous is not None:
+                self._apply(previous, -1)
+            self._rows[key] = record
+            self._apply(record, 1)
+        return self
+
+    def delete(self, keys):
+        """Remove the rows with the given keys (tuples of the key columns).
+
+        Raises ``KeyError`` without changing anything if a key is missing.
+        """
+        keys = list(dict.fromkeys(tuple(key) for key in keys))
+        for key in keys:
+            if key not in self._rows:
+                raise KeyError(key)
+        for key in keys:
+            self._apply(self._rows.pop(key), -1)
+        return self
+
+    def year_founded_counts(self):
+        return pd.Series(self.year_founded, name="count").sort_values(ascending=False, kind="stable")
+
+    def year_joined_counts(self):
+        return pd.Series(self.year_joined, name="count").sort_values(ascending=False, kind="stable")
+
+    def years_to_unicorn_stats(self):
+        """Mean, median and mode of Years to Unicorn, as the script prints them."""
+        tree = self.years_to_unicorn
+        return {"mean": tree.mean(), "median": tree.median(), "mode": tree.mode()}
+
+    def top_industries(self, n=5, by="Valuation"):
+        """Industries with the largest summed ``by`` (``Valuation`` or ``Funding``)."""
+        column = {"Valuation": 1, "Funding": 2}[by]
+        top = heapq.nlargest(n, self._industry.items(), key=lambda item: item[1][column])
+        return pd.DataFrame(
+            [(valuation, funding) for _, (_, valuation, funding) in top],
+            index=pd.Index([industry for industry, _ in top], name="Industry"),
+            columns=["Valuation", "Funding"],
+        )
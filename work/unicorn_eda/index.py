@@ -0,0 +1,147 @@
+"""Secondary indexes over the structured companies table.
+
+Filters such as ``companies[companies["Year Joined"] == 2015]`` build a full
+boolean mask per query.  A :class:`TableIndex` is built once and answers
+equality, membership, range and conjunctive filters with sorted arrays of row
+positions, touching only the matching rows::
+
+    index = TableIndex.from_frame(companies)
+    rows = index.rows({"Year Joined": 2015, "Continent": "Asia"})
+    companies.iloc[rows]
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .dates import date_parts
+from .instrument import instrumented
+
+
+INDEXED_COLUMNS = ("Year Joined", "Year Founded", "Industry", "Country/Region", "Continent")
+RANGE_COLUMNS = ("Valuation",)
+
+_EMPTY = np.zeros(0, dtype=np.int64)
+
+
+class PostingIndex:
+    """Value -> sorted row positions, stored in CSR form, for low-cardinality columns."""
+
+    def __init__(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Reuse the categorical codes, renumbered into sorted label order,
+            # rather than hashing every string again.
+            categories = values.cat.categories
+            ranks = np.empty(len(categories) + 1, dtype=np.int64)
+            ranks[categories.argsort()] = np.arange(len(categories))
+            ranks[-1] = -1
+            codes = ranks[values.cat.codes.to_numpy()]
+            labels = categories.sort_values()
+        else:
+            codes, labels = pd.factorize(values, sort=True)
+        codes = np.asarray(codes)
+        self.labels = pd.Index(labels)
+        order = np.argsort(codes, kind="stable")
+        self.rows = order[codes[order] >= 0].astype(np.int64)
+        self.ptr = np.zeros(len(self.labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes[codes >= 0], minlength=len(self.labels)), out=self.ptr[1:])
+
+    def equal(self, value):
+        return self.isin([value])
+
+    def isin(self, values):
+        codes = self.labels.get_indexer(list(values))
+        codes = np.unique(codes[codes >= 0])
+        if len(codes) == 1:
+            return self.rows[self.ptr[codes[0]]:self.ptr[codes[0] + 1]]
+        return np.sort(np.concatenate([_EMPTY] + [self.rows[self.ptr[c]:self.ptr[c + 1]] for c in codes]))
+
+    def between(self, low=None, high=None):
+        # Labels are sorted, so a value range is a contiguous run of codes.
+        first = 0 if low is None else self.labels.searchsorted(low, side="left")
+        last = len(self.labels) if high is None else self.labels.searchsorted(high, side="right")
+        return np.sort(self.rows[self.ptr[first]:self.ptr[last]])
+
+
+class SortedIndex:
+    """Row positions ordered by value, for range filters on numeric columns."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        order = np.argsort(values, kind="stable")
+        order = order[~np.isnan(values[order])]
+        self.order = order.astype(np.int64)
+        self.values = values[self.order]
+
+    def between(self, low=None, high=None):
+        first = 0 if low is None else np.searchsorted(self.values, low, side="left")
+        last = len(self.values) if high is None else np.searchsorted(self.values, high, side="right")
+        return np.sort(self.order[first:last])
+
+    def equal(self, value):
+        return self.between(value, value)
+
+    def isin(self, values):
+        return np.unique(np.concatenate([_EMPTY] + [self.equal(value) for value in values]))
+
+
+class TableIndex:
+    """Per-column indexes answering filters with sorted row-position arrays."""
+
+    def __init__(self, indexes, n_rows):
+        self.indexes = indexes
+        self.n_rows = n_rows
+
+    @classmethod
+    def from_frame(cls, frame, columns=INDEXED_COLUMNS, range_columns=RANGE_COLUMNS):
+        """Index ``columns`` with posting lists and ``range_columns`` by sort order.
+
+        ``Year Joined`` is taken from ``Date Joined`` when the frame has no such
+        column.
+        """
+        indexes = {}
+        for column in columns:
+            if column in frame:
+                values = frame[column]
+            elif column == "Year Joined":
+                values = date_parts(frame["Date Joined"].to_numpy())["year"]
+                values = np.where(values >= 0, values, np.nan)
+            else:
+                raise KeyError(column)
+            indexes[column] = PostingIndex(values)
+        for column in range_columns:
+            indexes[column] = SortedIndex(frame[column].to_numpy())
+        return cls(indexes, len(frame))
+
+    def _rows_for(self, column, condition):
+        index = self.indexes[column]
+        if isinstance(condition, tuple):
+            return index.between(*condition)
+        if isinstance(condition, (list, set, frozenset, np.ndarray, pd.Index)):
+            return index.isin(condition)
+        return index.equal(condition)
+
+    @instrumented("filter")
+    def rows(self, conditions):
+        """Sorted row positions matching every condition in ``conditions``.
+
+        Each condition maps an indexed column to a scalar (equality), a list or
+        set (membership) or a ``(low, high)`` tuple (inclusive range, ``None``
+        for an open end).
+        """
+        if not conditions:
+            return np.arange(self.n_rows, dtype=np.int64)
+        matches = sorted(
+            (self._rows_for(column, condition) for column, condition in conditions.items()),
+            key=len,
+        )
+        rows = matches[0]
+        for other in matches[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        return rows
+
+    def count(self, conditions):
+        return len(self.rows(conditions))
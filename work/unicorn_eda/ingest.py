@@ -0,0 +1,144 @@
+"""Parallel ingest of a directory of daily ``Unicorn_Companies.csv`` snapshots.
+
+Each snapshot is parsed in a worker process with the shared schema, money and
+date parsing.  Workers send back plain column arrays (category columns as
+integer codes plus their local categories); the parent remaps the codes onto
+one :class:`~unicorn_eda.encoding.CategoryDictionary` and copies every column
+straight into growing output buffers, so no list of per-file DataFrames is
+ever built or concatenated.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .encoding import CategoryDictionary
+from .instrument import disable
+from .loader import SCHEMA, read_companies_csv
+
+
+SNAPSHOT_COLUMN = "Snapshot"
+
+# Nullable schema dtypes, shipped as values plus a missing mask so that every
+# file's buffer dtype agrees whether or not it has missing values.
+_NULLABLE_KINDS = ("Int64",)
+
+
+def _parse_snapshot(path):
+    """Worker: parse one snapshot into ``{column: array, (codes, categories) or (values, mask)}``."""
+    frame = read_companies_csv(path)
+    columns = {}
+    for name, kind in SCHEMA.items():
+        values = frame[name]
+        if kind == "category":
+            columns[name] = (values.cat.codes.to_numpy(), list(values.cat.categories))
+        elif kind in _NULLABLE_KINDS:
+            columns[name] = (
+                values.to_numpy(values.dtype.numpy_dtype, na_value=0), values.isna().to_numpy()
+            )
+        else:
+            columns[name] = values.to_numpy()
+    return columns
+
+
+class _ColumnBuffer:
+    """Append-only array with amortised doubling growth."""
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def extend(self, values):
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    def array(self):
+        return self._data[:self._size]
+
+
+def _snapshot_labels(paths):
+    """File stems, or the path without its suffix where two files share a stem."""
+    files_per_stem = {}
+    for path in paths:
+        files_per_stem.setdefault(path.stem, set()).add(path)
+    return [
+        path.stem if len(files_per_stem[path.stem]) == 1 else path.with_suffix("").as_posix()
+        for path in paths
+    ]
+
+
+def snapshot_paths(directory, pattern="*.csv"):
+    """Snapshot files under ``directory`` matching ``pattern``, in name order."""
+    return sorted(Path(directory).glob(pattern))
+
+
+def ingest_snapshots(paths, processes=None, categories=None):
+    """Parse snapshot files in a process pool and merge them into one frame.
+
+    ``paths`` is a directory (every ``*.csv`` in it) or an iterable of files.
+    Rows keep file order; a ``Snapshot`` categorical column records the file
+    stem each row came from (the whole path without its suffix when stems
+    clash, e.g. ``a/2022-03-01`` and ``b/2022-03-01``).  ``processes=1``
+    parses in this process.
+    """
+    if isinstance(paths, (str, os.PathLike)) and Path(paths).is_dir():
+        paths = snapshot_paths(paths)
+    paths = [Path(path) for path in paths]
+    categories = CategoryDictionary() if categories is None else categories
+
+    buffers = {}
+    masks = {}
+    snapshot_codes = _ColumnBuffer(np.int32)
+
+    def merge(index, columns):
+        for name, values in columns.items():
+            if SCHEMA[name] == "category":
+                codes, local = values
+                dtype = pd.CategoricalDtype(categories.update(name, local))
+                remap = np.append(dtype.categories.get_indexer(local), -1).astype(np.int32)
+                values = remap[codes]
+            elif SCHEMA[name] in _NULLABLE_KINDS:
+                values, mask = values
+                masks.setdefault(name, _ColumnBuffer(np.bool_)).extend(mask)
+            if name not in buffers:
+                buffers[name] = _ColumnBuffer(values.dtype)
+            buffers[name].extend(values)
+            rows = len(values)
+        snapshot_codes.extend(np.full(rows, index, dtype=np.int32))
+
+    if processes == 1 or len(paths) <= 1:
+        for index, path in enumerate(paths):
+            merge(index, _parse_snapshot(path))
+    else:
+        # Forked workers would otherwise write to the parent's profiling sink.
+        with ProcessPoolExecutor(max_workers=processes, initializer=disable) as pool:
+            for index, columns in enumerate(pool.map(_parse_snapshot, paths)):
+                merge(index, columns)
+
+    if not buffers:
+        return pd.DataFrame(columns=[*SCHEMA, SNAPSHOT_COLUMN])
+    data = {}
+    for name, kind in SCHEMA.items():
+        values = buffers[name].array()
+        if kind == "category":
+            values = pd.Categorical.from_codes(values, dtype=categories.dtype(name))
+        elif kind in _NULLABLE_KINDS:
+            array_type = pd.api.types.pandas_dtype(kind).construct_array_type()
+            values = array_type(values, masks[name].array())
+        data[name] = values
+    # The same file passed twice shares one label.
+    label_codes, labels = pd.factorize(pd.Series(_snapshot_labels(paths), dtype=object))
+    data[SNAPSHOT_COLUMN] = pd.Categorical.from_codes(
+        label_codes[snapshot_codes.array()], list(labels)
+    )
+    return pd.DataFrame(data)
@@ -0,0 +1,195 @@
+"""Per-stage timing instrumentation for the structuring pipeline.
+
+Pipeline steps (load, duplicate removal, date parsing, feature derivation,
+filters, aggregations, plotting) are wrapped with :func:`instrumented` or run
+inside :func:`stage`.  When instrumentation is enabled every stage emits one
+record with its wall time, CPU time, rows in and out and resident-memory
+delta to a pluggable sink, e.g. JSON lines::
+
+    from unicorn_eda import instrument
+    instrument.enable(instrument.JsonLinesSink("stages.jsonl"))
+
+Importing the package never turns it on.  Entry points (the activity script,
+``python -m unicorn_eda.service`` and ``python -m unicorn_eda.bench``) call
+:func:`configure_from_env`, which honours ``UNICORN_EDA_PROFILE=stages.jsonl``
+(``-`` for stderr).  When disabled, a wrapped call costs one flag check.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+
+PROFILE_ENV_VAR = "UNICORN_EDA_PROFILE"
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - non-POSIX
+    _PAGE_SIZE = None
+
+
+def _rss_bytes():
+    """Current resident set size, or ``None`` where /proc is unavailable."""
+    if _PAGE_SIZE is None:
+        return None
+    try:
+        with open("/proc/self/statm", "rb") as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        return None
+
+
+def _rows(value):
+    shape = getattr(value, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+class JsonLinesSink:
+    """Write each record as one JSON line to a path or an open text stream."""
+
+    def __init__(self, target):
+        self._owned = isinstance(target, (str, os.PathLike))
+        self._stream = open(target, "a", encoding="utf-8") if self._owned else target
+
+    def __call__(self, record):
+        self._stream.write(json.dumps(record) + "\n")
+        self._stream.flush()
+
+    def close(self):
+        if self._owned:
+            self._stream.close()
+
+
+class ListSink(list):
+    """Collect records in memory (handy in notebooks)."""
+
+    def __call__(self, record):
+        self.append(record)
+
+
+class _State:
+    enabled = False
+    sinks = []
+
+
+def enable(*sinks):
+    """Turn instrumentation on, sending records to ``sinks`` (callables)."""
+    _State.sinks = list(sinks)
+    _State.enabled = bool(_State.sinks)
+
+
+def disable():
+    _State.enabled = False
+    _State.sinks = []
+
+
+def is_enabled():
+    return _State.enabled
+
+
+def configure_from_env(environ=os.environ):
+    """Enable a JSON-lines sink if ``UNICORN_EDA_PROFILE`` is set; returns the sink.
+
+    A file opened here is closed when the interpreter exits.
+    """
+    target = environ.get(PROFILE_ENV_VAR)
+    if not target:
+        return None
+    sink = JsonLinesSink(sys.stderr if target == "-" else target)
+    atexit.register(sink.close)
+    enable(sink)
+    return sink
+
+
+class StageRecord(dict):
+    """Mutable record of one stage; set ``rows_out`` or extra keys while it runs."""
+
+    @property
+    def rows_out(self):
+        return self.get("rows_out")
+
+    @rows_out.setter
+    def rows_out(self, value):
+        self["rows_out"] = value
+
+
+class _NullRecord:
+    """Shared record handed out while disabled; ignores every assignment."""
+
+    @property
+    def rows_out(self):
+        return None
+
+    @rows_out.setter
+    def rows_out(self, value):
+        pass
+
+    def __setitem__(self, key, value):
+        pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+@contextmanager
+def _measured(name, rows_in):
+    record = StageRecord(stage=name, rows_in=rows_in, rows_out=None)
+    rss_before = _rss_bytes()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    record["started_at"] = time.time()
+    try:
+        yield record
+    finally:
+        record["wall_seconds"] = time.perf_counter() - start_wall
+        record["cpu_seconds"] = time.process_time() - start_cpu
+        rss_after = _rss_bytes()
+        record["memory_delta_bytes"] = (
+            None if rss_before is None or rss_after is None else rss_after - rss_before
+        )
+        for sink in _State.sinks:
+            sink(dict(record))
+
+
+@contextmanager
+def _unmeasured():
+    yield _NULL_RECORD
+
+
+def stage(name, rows_in=None):
+    """Context manager measuring the enclosed block as stage ``name``.
+
+    The yielded record accepts ``rows_out`` and any extra keys::
+
+        with stage("filter 2015", rows_in=len(companies)) as record:
+            joined_2015 = companies[companies["Year Joined"] == 2015]
+            record.rows_out = len(joined_2015)
+    """
+    if not _State.enabled:
+        return _unmeasured()
+    return _measured(name, rows_in)
+
+
+def instrumented(name):
+    """Decorate a pipeline function so each call is measured as stage ``name``.
+
+    Rows in are taken from the first argument with a ``shape`` and rows out
+    from the result's ``shape``, when there is one.
+    """
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _State.enabled:
+                return function(*args, **kwargs)
+            rows_in = next((r for r in map(_rows, args) if r is not None), None)
+            with _measured(name, rows_in) as record:
+                result = function(*args, **kwargs)
+                record.rows_out = _rows(result)
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,128 @@
+"""Company <-> investor adjacency built from the ``Select Investors`` column.
+
+The comma-joined investor strings are split once and every investor name is
+interned to an integer id.  The relation is then stored twice in CSR form:
+
+* ``company_ptr`` / ``company_investors``: the investor ids of row ``i`` are
+  ``company_investors[company_ptr[i]:company_ptr[i + 1]]``;
+* ``investor_ptr`` / ``investor_companies``: the row numbers of investor ``j``
+  are ``investor_companies[investor_ptr[j]:investor_ptr[j + 1]]``.
+
+Company names are looked up through a hash index of their rows, and
+queries walk only the rows touched by the investors involved instead of
+scanning every investor string with ``str.contains``.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def _csr(keys, values, size):
+    """Group ``values`` by integer ``keys`` in ``[0, size)`` into CSR arrays."""
+    order = np.argsort(keys, kind="stable")
+    ptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=size), out=ptr[1:])
+    return ptr, values[order]
+
+
+class InvestorIndex:
+    """Interned investor table with CSR adjacency in both directions."""
+
+    def __init__(self, companies, investors, company_ids, investor_ids, valuation=None):
+        self.companies = pd.Index(companies)
+        self.investors = pd.Index(investors)
+        self.valuation = None if valuation is None else np.asarray(valuation, dtype=np.float64)
+        company_ids = np.asarray(company_ids, dtype=np.int64)
+        investor_ids = np.asarray(investor_ids, dtype=np.int64)
+        # An investor named twice in one row's string backs that company once.
+        width = max(len(self.investors), 1)
+        company_ids, investor_ids = np.divmod(np.unique(company_ids * width + investor_ids), width)
+        self.company_ptr, self.company_investors = _csr(
+            company_ids, investor_ids, len(self.companies)
+        )
+        self.investor_ptr, self.investor_companies = _csr(
+            investor_ids, company_ids, len(self.investors)
+        )
+        # Company name -> its row numbers (names may repeat across snapshots).
+        name_ids, names = pd.factorize(self.companies)
+        self._names = pd.Index(names)
+        self._name_ptr, self._name_rows = _csr(
+            name_ids, np.arange(len(self.companies)), len(self._names)
+        )
+
+    @classmethod
+    def from_frame(cls, frame, column="Select Investors", company="Company", valuation="Valuation"):
+        """Build the index from a companies frame (one row per company)."""
+        names = frame[column].reset_index(drop=True).str.split(",").explode()
+        names = names.str.strip()
+        names = names[names.notna() & (names != "")]
+        investor_ids, investors = pd.factorize(names, sort=True)
+        values = frame[valuation].to_numpy() if valuation in frame else None
+        return cls(
+            frame[company].to_numpy(),
+            investors,
+            names.index.to_numpy(),
+            investor_ids,
+            valuation=values,
+        )
+
+    def _company_rows(self, company):
+        i = self._names.get_loc(company)
+        return self._name_rows[self._name_ptr[i]:self._name_ptr[i + 1]]
+
+    def _investor_id(self, investor):
+        return self.investors.get_loc(investor)
+
+    def _investors_of_rows(self, rows):
+        return np.unique(np.concatenate(
+            [self.company_investors[self.company_ptr[r]:self.company_ptr[r + 1]] for r in rows]
+        ))
+
+    def investors_of(self, company):
+        """Return the investor names of ``company``."""
+        return list(self.investors[self._investors_of_rows(self._company_rows(company))])
+
+    def companies_of(self, investor):
+        """Return the companies backed by ``investor``."""
+        j = self._investor_id(investor)
+        rows = self.investor_companies[self.investor_ptr[j]:self.investor_ptr[j + 1]]
+        return list(self.companies[rows])
+
+    def co_investment_counts(self, company):
+        """Count the investors each other company shares with ``company``.
+
+        Returns a Series indexed by company name, largest overlap first.
+        Companies with no shared investor are left out.
+        """
+        rows = self._company_rows(company)
+        investor_ids = self._investors_of_rows(rows)
+        if len(investor_ids) == 0:
+            return pd.Series([], dtype=np.int64, name="Shared Investors")
+        starts = self.investor_ptr[investor_ids]
+        stops = self.investor_ptr[investor_ids + 1]
+        neighbours = np.concatenate(
+            [self.investor_companies[start:stop] for start, stop in zip(starts, stops)]
+        )
+        hits, counts = np.unique(neighbours, return_counts=True)
+        others = ~np.isin(hits, rows)
+        hits, counts = hits[others], counts[others]
+        order = np.argsort(-counts, kind="stable")
+        return pd.Series(counts[order], index=self.companies[hits[order]], name="Shared Investors")
+
+    def portfolio(self):
+        """Per-investor portfolio size and total valuation, indexed by investor."""
+        sizes = np.diff(self.investor_ptr)
+        data = {"Companies": sizes}
+        if self.valuation is not None:
+            weights = np.nan_to_num(self.valuation[self.investor_companies])
+            owners = np.repeat(np.arange(len(self.investors)), sizes)
+            data["Portfolio Valuation"] = np.bincount(
+                owners, weights=weights, minlength=len(self.investors)
+            )
+        return pd.DataFrame(data, index=self.investors)
+
+    def top_investors(self, n=10, by="Portfolio Valuation"):
+        """Return the ``n`` investors with the largest ``by`` (valuation or ``Companies``)."""
+        return self.portfolio().nlargest(n, by)
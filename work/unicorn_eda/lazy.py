@@ -0,0 +1,341 @@
+"""Lazy, optimized queries over the companies CSV.
+
+A :class:`LazyFrame` only records operations; :meth:`LazyFrame.collect`
+optimizes the recorded plan and runs it::
+
+    from unicorn_eda.lazy import col, scan_csv
+
+    top = (
+        scan_csv("Unicorn_Companies.csv")
+        .filter(col("Year Joined") == 2015)
+        .group_by("Industry")
+        .agg({"Valuation": "sum", "Funding": "sum"})
+        .top_k(5, "Valuation")
+        .collect()
+    )
+
+The optimizer
+
+* prunes columns: only the columns the plan touches are read from the CSV
+  (``Select Investors`` is never read unless asked for);
+* pushes predicates down: filters on columns that need no parsing (``Year
+  Founded``, the category and text columns) run on the raw rows first, then
+  ``Date Joined`` is parsed for date/derived filters, and the money columns
+  are parsed last, so every parse sees as few rows as possible;
+* fuses derived columns into one :func:`~unicorn_eda.features.derive` call,
+  adding any derived column a filter or group-by refers to.
+
+Filters recorded after a ``top_k`` apply to the rows it kept, and filters
+recorded after an aggregation apply to the aggregated rows.
+"""
+
+from __future__ import annotations
+
+import operator
+
+import numpy as np
+import pandas as pd
+
+from .dates import DateMemo
+from .encoding import CategoryDictionary
+from .features import FEATURE_SOURCES, FEATURES, derive
+from .loader import SCHEMA, csv_dtypes
+from .money import parse_money
+from .topk import top_k
+
+
+_ENCODED_KINDS = ("category",)
+
+
+class Predicate:
+    """Row filter over one or more named columns; combine with ``&``."""
+
+    def __init__(self, columns, evaluate, description, parts=None):
+        self.columns = frozenset(columns)
+        self._evaluate = evaluate
+        self.description = description
+        self._parts = [self] if parts is None else parts
+
+    def __call__(self, frame):
+        # Comparisons on nullable columns give <NA> for missing values: no match.
+        return pd.Series(self._evaluate(frame), copy=False).fillna(False).to_numpy(dtype=bool)
+
+    def __and__(self, other):
+        return Predicate(
+            self.columns | other.columns,
+            lambda frame: self(frame) & other(frame),
+            f"({self.description}) & ({other.description})",
+            self._parts + other._parts,
+        )
+
+    def split(self):
+        """The conjuncts of this predicate, so each can be pushed down separately."""
+        return list(self._parts)
+
+    def __repr__(self):
+        return f"Predicate({self.description})"
+
+
+class Column:
+    """Reference to a column, producing predicates through comparisons."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def _compare(self, op, symbol, value):
+        name = self.name
+        return Predicate([name], lambda frame: op(frame[name], value), f"{name} {symbol} {value!r}")
+
+    def __eq__(self, value):
+        return self._compare(operator.eq, "==", value)
+
+    def __ne__(self, value):
+        return self._compare(operator.ne, "!=", value)
+
+    def __lt__(self, value):
+        return self._compare(operator.lt, "<", value)
+
+    def __le__(self, value):
+        return self._compare(operator.le, "<=", value)
+
+    def __gt__(self, value):
+        return self._compare(operator.gt, ">", value)
+
+    def __ge__(self, value):
+        return self._compare(operator.ge, ">=", value)
+
+    __hash__ = None
+
+    def isin(self, values):
+        name, values = self.name, list(values)
+        return Predicate([name], lambda frame: frame[name].isin(values), f"{name} in {values!r}")
+
+    def between(self, low, high):
+        """Inclusive range filter."""
+        name = self.name
+        return Predicate(
+            [name], lambda frame: frame[name].between(low, high), f"{low!r} <= {name} <= {high!r}"
+        )
+
+
+def col(name):
+    return Column(name)
+
+
+class LazyFrame:
+    """Recorded query plan over a companies CSV or an already structured frame."""
+
+    def __init__(self, source, operations=()):
+        self._source = source
+        self._operations = list(operations)
+
+    def _then(self, *operation):
+        return LazyFrame(self._source, [*self._operations, operation])
+
+    def filter(self, *predicates):
+        """Keep rows matching every predicate."""
+        combined = predicates[0]
+        for predicate in predicates[1:]:
+            combined = combined & predicate
+        return self._then("filter", combined)
+
+    def derive(self, *names):
+        """Add registered derived columns (see :data:`unicorn_eda.features.FEATURES`)."""
+        return self._then("derive", names)
+
+    def select(self, *columns):
+        return self._then("select", columns)
+
+    def group_by(self, *keys):
+        return _GroupBy(self, keys)
+
+    def top_k(self, k, column, largest=True):
+        return self._then("top_k", k, column, largest)
+
+    # -- planning -------------------------------------------------------
+
+    def _split(self):
+        """Split the operations into the row-level part and the part after ``agg``."""
+        for i, operation in enumerate(self._operations):
+            if operation[0] == "agg":
+                return self._operations[:i], self._operations[i:]
+        return self._operations, []
+
+    def _plan(self):
+        row_ops, post_ops = self._split()
+        predicates, derived, selected, ranked = [], [], None, []
+        for operation in row_ops:
+            kind = operation[0]
+            if kind == "top_k" or (ranked and kind == "filter"):
+                # A filter recorded after a top_k only sees the rows it kept,
+                # so it cannot be pushed down past it.
+                ranked.append(operation)
+            elif kind == "filter":
+                predicates.extend(operation[1].split())
+            elif kind == "derive":
+                derived.extend(operation[1])
+            elif kind == "select":
+                selected = list(operation[1])
+
+        referenced = set()
+        for predicate in predicates:
+            referenced |= predicate.columns
+        for operation in post_ops:
+            if operation[0] == "agg":
+                referenced |= set(operation[1]) | set(operation[2])
+        for operation in ranked:
+            if operation[0] == "top_k":
+                referenced.add(operation[2])
+            else:
+                referenced |= operation[1].columns
+        unknown = {name for name in referenced if name not in SCHEMA and name not in FEATURES}
+        for operation in ranked:
+            if operation[0] == "filter" and operation[1].columns & unknown:
+                missing = sorted(operation[1].columns & unknown)
+                raise KeyError(f"unknown column(s) in filter: {', '.join(missing)}")
+
+        if selected is not None:
+            output = list(selected)
+        elif any(op[0] == "agg" for op in post_ops):
+            output = []
+        else:
+            output = [*SCHEMA, *derived]
+        referenced |= set(output)
+
+        derived = list(dict.fromkeys(derived + [name for name in referenced if name in FEATURES]))
+        raw_columns = {name for name in referenced if name in SCHEMA}
+        for name in derived:
+            raw_columns |= set(FEATURE_SOURCES[name])
+        return {
+            "columns": [name for name in SCHEMA if name in raw_columns],
+            "predicates": predicates,
+            "derived": derived,
+            "output": output,
+            "ranked": ranked,
+            "post": post_ops,
+        }
+
+    def explain(self):
+        """Describe the optimized plan, one step per line."""
+        plan = self._plan()
+        lines = [f"scan {plan['columns']}"]
+        for step, predicates, parse, derived in self._stages(plan):
+            if parse:
+                lines.append(f"{step}: parse {parse}")
+            if derived:
+                lines.append(f"{step}: derive {derived}")
+            for predicate in predicates:
+                lines.append(f"{step}: filter {predicate.description}")
+        for operation in plan["ranked"]:
+            if operation[0] == "top_k":
+                lines.append(f"top_k {operation[1]} by {operation[2]}")
+            else:
+                lines.append(f"filter {operation[1].description}")
+        if plan["output"]:
+            lines.append(f"select {plan['output']}")
+        for operation in plan["post"]:
+            lines.append(" ".join(str(part) for part in operation if not callable(part)))
+        return "\n".join(lines)
+
+    def _stages(self, plan):
+        """Order parsing and filtering: raw filters, then dates, then money."""
+        columns = plan["columns"]
+        is_raw = isinstance(self._source, pd.DataFrame)
+        dates = [] if is_raw else [c for c in columns if SCHEMA[c] == "date"]
+        money = [] if is_raw else [c for c in columns if SCHEMA[c] == "money"]
+        date_derived = [
+            name for name in plan["derived"]
+            if not set(FEATURE_SOURCES[name]) & set(money)
+        ]
+        available = {c for c in columns if c not in dates and c not in money}
+        remaining = list(plan["predicates"])
+        stages = []
+        for step, parse, derived in (
+            ("raw", [], []),
+            ("dates", dates, date_derived),
+            ("money", money, [n for n in plan["derived"] if n not in date_derived]),
+        ):
+            available |= set(parse) | set(derived)
+            ready = [p for p in remaining if p.columns <= available]
+            remaining = [p for p in remaining if p not in ready]
+            stages.append((step, ready, parse, derived))
+        if remaining:
+            missing = set().union(*(p.columns for p in remaining)) - available
+            raise KeyError(f"unknown column(s) in filter: {', '.join(sorted(missing))}")
+        return stages
+
+    # -- execution ------------------------------------------------------
+
+    def collect(self):
+        """Run the optimized plan and return a DataFrame."""
+        plan = self._plan()
+        if isinstance(self._source, pd.DataFrame):
+            frame = self._source[plan["columns"]]
+        else:
+            schema = {name: SCHEMA[name] for name in plan["columns"]}
+            frame = pd.read_csv(self._source, usecols=plan["columns"], dtype=csv_dtypes(schema))
+
+        date_memo = DateMemo()
+        for step, predicates, parse, derived in self._stages(plan):
+            frame = frame.copy(deep=False)
+            for name in parse:
+                if SCHEMA[name] == "date":
+                    frame[name] = date_memo.parse(frame[name])
+                else:
+                    frame[name] = parse_money(frame[name])
+            if derived:
+                derive(frame, derived)
+            for predicate in predicates:
+                frame = frame[predicate(frame)]
+
+        if not isinstance(self._source, pd.DataFrame):
+            # Category encoding happens last, on the rows that survived.
+            categories = CategoryDictionary()
+            frame = frame.copy(deep=False)
+            for name in plan["columns"]:
+                if SCHEMA[name] in _ENCODED_KINDS:
+                    frame[name] = categories.encode(name, frame[name])
+
+        for operation in plan["ranked"]:
+            frame = _apply_post(frame, operation)
+        if plan["output"]:
+            frame = frame[plan["output"]]
+        for operation in plan["post"]:
+            frame = _apply_post(frame, operation)
+        return frame
+
+
+class _GroupBy:
+    def __init__(self, lazy, keys):
+        self._lazy = lazy
+        self._keys = list(keys)
+
+    def agg(self, aggregations=None, **named):
+        """Aggregate columns: ``{"Valuation": "sum"}`` or ``Valuation="sum"``."""
+        aggregations = {**(aggregations or {}), **named}
+        return self._lazy._then("agg", tuple(self._keys), aggregations)
+
+
+def _apply_post(frame, operation):
+    kind = operation[0]
+    if kind == "agg":
+        _, keys, aggregations = operation
+        return frame.groupby(list(keys), observed=True, sort=True).agg(aggregations)
+    if kind == "filter":
+        return frame[operation[1](frame)]
+    if kind == "top_k":
+        _, k, column, largest = operation
+        return top_k(frame, column, k, largest)
+    if kind == "select":
+        return frame[list(operation[1])]
+    raise ValueError(f"{kind} is not supported after an aggregation")
+
+
+def scan_csv(path):
+    """Start a lazy query over a companies CSV."""
+    return LazyFrame(str(path))
+
+
+def from_frame(frame):
+    """Start a lazy query over an already structured companies frame."""
+    return LazyFrame(frame)
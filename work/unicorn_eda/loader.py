@@ -0,0 +1,147 @@
+"""Typed, cached loading of ``Unicorn_Companies.csv``.
+
+The raw CSV is parsed once against an explicit schema and the typed frame is
+written to a Parquet cache keyed by the SHA-256 of the file contents.  Warm
+runs read the cache back with the stored column types, so no type inference
+happens after the first load.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import pandas as pd
+
+from .atomic import atomic_path
+from .dates import DateMemo
+from .encoding import CategoryDictionary
+from .instrument import instrumented
+from .money import parse_money
+
+try:
+    import pyarrow  # noqa: F401  (pandas needs an engine for Parquet)
+except ImportError:  # pragma: no cover - the cache is only an optimisation
+    pyarrow = None
+
+
+# Column name -> dtype used when reading the CSV.  ``date``, ``money`` and
+# ``category`` columns are read as text and converted explicitly instead of
+# being inferred; money columns end up as float64 dollars and category columns
+# as pandas categoricals encoded with a shared CategoryDictionary.  ``Year
+# Founded`` is a nullable integer so a blank year loads as <NA>.
+SCHEMA = {
+    "Company": str,
+    "Valuation": "money",
+    "Date Joined": "date",
+    "Industry": "category",
+    "City": "category",
+    "Country/Region": "category",
+    "Continent": "category",
+    "Year Founded": "Int64",
+    "Funding": "money",
+    "Select Investors": str,
+}
+
+# Bump whenever the schema or parsing rules change so stale caches are ignored.
+SCHEMA_VERSION = 5
+
+_TEXT_KINDS = ("date", "money", "category")
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_digest(path):
+    """Return the hex SHA-256 digest of the file at ``path``."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def csv_dtypes(schema=SCHEMA):
+    """``read_csv`` dtypes for ``schema``: text for the columns parsed after reading."""
+    return {name: (str if kind in _TEXT_KINDS else kind) for name, kind in schema.items()}
+
+
+def structure_frame(frame, schema=SCHEMA, date_memo=None, categories=None):
+    """Convert the raw text columns of ``frame`` to their schema types in place.
+
+    Pass a shared ``date_memo`` when structuring several chunks or snapshots so
+    each distinct date string is parsed only once, and a shared ``categories``
+    dictionary so category codes agree between them.
+    """
+    if date_memo is None:
+        date_memo = DateMemo()
+    if categories is None:
+        categories = CategoryDictionary()
+    for name, kind in schema.items():
+        if name not in frame:
+            continue
+        if kind == "date":
+            frame[name] = date_memo.parse(frame[name])
+        elif kind == "money":
+            frame[name] = parse_money(frame[name])
+        elif kind == "category":
+            frame[name] = categories.encode(name, frame[name])
+    return frame
+
+
+def read_companies_csv(path, schema=SCHEMA, categories=None, **read_csv_kwargs):
+    """Parse ``path`` with the explicit ``schema``, bypassing the Parquet cache."""
+    frame = pd.read_csv(
+        path,
+        usecols=list(schema),
+        dtype=csv_dtypes(schema),
+        **read_csv_kwargs,
+    )
+    return structure_frame(frame, schema, categories=categories)
+
+
+def _default_cache_dir(path):
+    return Path(path).parent / ".unicorn_cache"
+
+
+def cache_path(path, cache_dir=None, digest=None):
+    """Return the Parquet cache location for the CSV at ``path``."""
+    path = Path(path)
+    if cache_dir is None:
+        cache_dir = _default_cache_dir(path)
+    if digest is None:
+        digest = file_digest(path)
+    name = f"{path.stem}-v{SCHEMA_VERSION}-{digest[:16]}.parquet"
+    return Path(cache_dir) / name
+
+
+@instrumented("load")
+def load_companies(path="Unicorn_Companies.csv", cache_dir=None, use_cache=True, digest=None):
+    """Load the companies table with typed columns.
+
+    The first call for a given file parses the CSV and stores a Parquet copy
+    under ``cache_dir`` (``.unicorn_cache`` next to the CSV by default).  Later
+    calls for identical file contents read the Parquet copy instead.  Editing
+    the CSV changes its digest, so the stale cache is simply not found.
+
+    Category columns are encoded with the dictionary kept in
+    ``cache_dir/categories.json``, so every snapshot loaded through the same
+    cache directory uses the same integer codes for the same values.
+
+    Pass ``digest`` when the caller already has the :func:`file_digest` of
+    ``path`` to avoid hashing the file again.
+    """
+    if not use_cache or pyarrow is None:
+        return read_companies_csv(path)
+
+    cache_dir = _default_cache_dir(path) if cache_dir is None else Path(cache_dir)
+    cached = cache_path(path, cache_dir, digest)
+    if cached.exists():
+        return pd.read_parquet(cached)
+
+    dictionary_path = cache_dir / "categories.json"
+    categories = CategoryDictionary.load(dictionary_path)
+    frame = read_companies_csv(path, categories=categories)
+    if categories.changed:
+        categories.save(dictionary_path)
+    with atomic_path(cached) as tmp:
+        frame.to_parquet(tmp, index=False)
+    return frame
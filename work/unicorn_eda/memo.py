@@ -0,0 +1,201 @@
+"""Memoized answers to repeated questions about an unchanged dataset.
+
+A :class:`ResultCache` stores results under the key
+``(dataset fingerprint, normalized query)``.  The fingerprint is the SHA-256
+of the CSV contents (see :func:`~unicorn_eda.loader.file_digest`), so editing
+the file changes every key and stale answers are never returned; the old
+entries are dropped the first time the new contents are seen (on disk too:
+the digest last seen for each path is kept in ``datasets.json``).  Re-hashing
+is avoided while the file's size and modification time are unchanged.
+
+Entries live in a size-bounded LRU in memory and, with ``directory``, are also
+pickled to disk so a rerun of the notebook starts warm::
+
+    cache = ResultCache(directory=".unicorn_cache/results")
+
+    @cache.memoize
+    def most_common_industry(path, year):
+        companies = derive(load_companies(path), ["Year Joined"])
+        return companies.loc[companies["Year Joined"] == year, "Industry"].mode()[0]
+
+    most_common_industry("Unicorn_Companies.csv", 2015)   # computed
+    most_common_industry("Unicorn_Companies.csv", year=2015)  # cached
+
+Results are returned as stored, not copied; treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from pathlib import Path
+
+from .atomic import atomic_path
+from .loader import file_digest
+
+
+DEFAULT_MAXSIZE = 128
+
+_DATASETS = "datasets.json"
+
+
+def normalize_query(query=None, **params):
+    """Return a canonical string for a query.
+
+    Strings are case-folded with whitespace collapsed; mappings (and keyword
+    ``params``) are serialized as JSON with sorted keys, so the order the
+    parameters were given in does not matter.
+    """
+    if isinstance(query, str) and not params:
+        return " ".join(query.casefold().split())
+    if query is not None:
+        params = {**dict(query), **params}
+    return json.dumps(params, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class ResultCache:
+    """LRU of query results keyed by dataset fingerprint, optionally on disk."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, directory=None):
+        self.maxsize = maxsize
+        self.directory = None if directory is None else Path(directory)
+        self._entries = collections.OrderedDict()
+        self._digests = {}  # path -> (size, mtime_ns, digest)
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def dataset_fingerprint(self, path):
+        """Digest of the file at ``path``, re-hashed only when its size or mtime change.
+
+        When the digest differs from the one seen before for ``path``, the
+        entries computed from the old contents are invalidated.
+        """
+        path = os.fspath(path)
+        status = os.stat(path)
+        known = self._digests.get(path)
+        if known and known[:2] == (status.st_size, status.st_mtime_ns):
+            return known[2]
+        digest = self.track_dataset(path, file_digest(path))
+        self._digests[path] = (status.st_size, status.st_mtime_ns, digest)
+        return digest
+
+    def track_dataset(self, path, digest):
+        """Record ``digest`` as the current fingerprint of the dataset at ``path``.
+
+        Use this when the fingerprint comes from elsewhere (e.g. a column
+        store manifest); entries computed from the fingerprint recorded
+        before for ``path`` are invalidated.
+        """
+        path = os.fspath(path)
+        known = self._digests.pop(path, None)
+        previous = known[2] if known else self._recorded_digests().get(path)
+        if previous and previous != digest:
+            self.invalidate(previous)
+        if self.directory is not None and previous != digest:
+            self._record_digest(path, digest)
+        return digest
+
+    def _recorded_digests(self):
+        if self.directory is None:
+            return {}
+        try:
+            with open(self.directory / _DATASETS, encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_digest(self, path, digest):
+        recorded = {**self._recorded_digests(), path: digest}
+        with atomic_path(self.directory / _DATASETS) as tmp:
+            with open(tmp, "w", encoding="utf-8") as handle:
+                json.dump(recorded, handle, indent=1)
+
+    @staticmethod
+    def _key(fingerprint, query):
+        return hashlib.sha256(f"{fingerprint}\0{query}".encode("utf-8")).hexdigest()
+
+    def _file(self, fingerprint, key):
+        return self.directory / fingerprint[:16] / f"{key}.pkl"
+
+    def _remember(self, key, fingerprint, value):
+        self._entries[key] = (fingerprint, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, fingerprint, query, default=None):
+        """Return the cached result for ``query`` over ``fingerprint``, or ``default``."""
+        key = self._key(fingerprint, query)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key][1]
+        if self.directory is not None:
+            path = self._file(fingerprint, key)
+            try:
+                with open(path, "rb") as handle:
+                    value = pickle.load(handle)
+            except (OSError, EOFError, pickle.UnpicklingError):
+                return default
+            self._remember(key, fingerprint, value)
+            return value
+        return default
+
+    def put(self, fingerprint, query, value):
+        key = self._key(fingerprint, query)
+        self._remember(key, fingerprint, value)
+        if self.directory is not None:
+            with atomic_path(self._file(fingerprint, key)) as tmp, open(tmp, "wb") as handle:
+                pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        return value
+
+    def get_or_compute(self, fingerprint, query, compute):
+        """Return the cached result, calling ``compute()`` and storing it on a miss."""
+        missing = object()
+        value = self.get(fingerprint, query, missing)
+        if value is not missing:
+            self.hits += 1
+            return value
+        self.misses += 1
+        return self.put(fingerprint, query, compute())
+
+    def invalidate(self, fingerprint=None):
+        """Drop the entries computed from ``fingerprint`` (all entries if ``None``)."""
+        for key in [k for k, (f, _) in self._entries.items() if fingerprint in (None, f)]:
+            del self._entries[key]
+        if self.directory is None or not self.directory.exists():
+            return
+        folders = (
+            [self.directory / fingerprint[:16]] if fingerprint else list(self.directory.iterdir())
+        )
+        for folder in folders:
+            if folder.is_dir():
+                for entry in folder.iterdir():
+                    entry.unlink(missing_ok=True)
+                folder.rmdir()
+
+    def memoize(self, function):
+        """Decorate ``function(path, ...)`` so its results are cached per dataset.
+
+        The first argument is the CSV path; the remaining arguments, bound to
+        their parameter names, form the normalized query.
+        """
+        signature = inspect.signature(function)
+        name = f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(path, *args, **kwargs):
+            bound = signature.bind(path, *args, **kwargs)
+            bound.apply_defaults()
+            params = dict(list(bound.arguments.items())[1:])
+            query = f"{name}:{normalize_query(params)}"
+            return self.get_or_compute(
+                self.dataset_fingerprint(path), query, lambda: function(path, *args, **kwargs)
+            )
+        return wrapper
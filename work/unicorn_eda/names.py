@@ -0,0 +1,221 @@
+"""Fuzzy company-name resolution across snapshots.
+
+Company names drift between snapshots (``Bytedance`` / ``ByteDance Ltd.`` /
+``Byte-Dance``), which exact ``drop_duplicates`` cannot see.  Names are first
+normalized (:func:`normalize_names`: case, accents, punctuation, ``&``,
+trailing legal suffixes), then compared through MinHash signatures of their
+character n-grams.  A :class:`NameIndex` stores the signatures in
+locality-sensitive-hashing bands, so a lookup only scores the names that
+share at least one band with the query instead of every name in the table.
+
+Everything runs on NumPy arrays: n-grams are read off a fixed-width byte
+matrix (as in :mod:`unicorn_eda.money`), the signatures of a whole batch are
+computed one hash function at a time, and each band is a sorted key array
+searched with ``searchsorted``.  Scores are the fraction of agreeing
+signature entries, an estimate of the Jaccard similarity of the two n-gram
+sets (exact normalized matches score 1).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .instrument import instrumented
+
+
+DEFAULT_NGRAM = 2
+DEFAULT_BANDS = 24
+DEFAULT_ROWS = 3
+DEFAULT_THRESHOLD = 0.5
+DEFAULT_MAX_BUCKET = 64
+
+# Legal-form suffixes removed from the end of a normalized name.
+LEGAL_SUFFIXES = (
+    "ab", "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc",
+    "incorporated", "limited", "llc", "ltd", "nv", "oy", "plc", "pte", "pvt",
+    "sa", "sas", "srl",
+)
+
+_SUFFIX_PATTERN = r"(?:\s+(?:" + "|".join(LEGAL_SUFFIXES) + r"))+$"
+# Mersenne prime 2**31 - 1; n-gram codes and hash parameters stay below it so
+# ``a * code + b`` fits in uint64.
+_PRIME = np.uint64((1 << 31) - 1)
+_MAX_WIDTH = 64
+_BATCH = 100_000
+# Queries scored together; bounds the candidate pairs held at once to
+# ``_QUERY_BATCH * bands * max_bucket``.
+_QUERY_BATCH = 4096
+
+
+def normalize_names(names):
+    """Return ``names`` normalized for matching, as a Series of strings.
+
+    Lower-cases, strips accents, spells ``&`` as ``and``, turns punctuation
+    into spaces, drops trailing legal suffixes (``Inc.``, ``Ltd``, ``GmbH``,
+    ...) and collapses whitespace.  Missing names become ``""``.
+    """
+    names = pd.Series(names, dtype=object).fillna("").astype(str)
+    names = names.str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+    names = names.str.casefold().str.replace("&", " and ", regex=False)
+    names = names.str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+    names = names.str.replace(_SUFFIX_PATTERN, "", regex=True)
+    return names.str.replace(r"\s+", " ", regex=True)
+
+
+def _ngram_codes(normalized, n):
+    """n-gram codes (``uint64``, ``(rows, positions)``) and their validity mask.
+
+    Names are padded with one space on each side so short names and word
+    boundaries produce n-grams too; names longer than 64 bytes are truncated.
+    """
+    padded = (" " + normalized + " ").to_numpy(dtype=object)
+    raw = np.asarray(padded, dtype=np.bytes_)
+    if raw.dtype.itemsize > _MAX_WIDTH:
+        raw = raw.astype(f"S{_MAX_WIDTH}")
+    rows, width = len(raw), raw.dtype.itemsize
+    chars = raw.view(np.uint8).reshape(rows, width).astype(np.uint64)
+    lengths = np.char.str_len(raw)
+    positions = max(width - n + 1, 1)
+    codes = np.zeros((rows, positions), dtype=np.uint64)
+    for k in range(n):
+        codes = (codes << np.uint64(8)) | chars[:, k:k + positions]
+    valid = np.arange(positions) < (lengths - n + 1)[:, None]
+    # A name shorter than ``n`` still contributes its (zero-padded) prefix.
+    valid[:, 0] |= lengths > 0
+    return codes % _PRIME, valid
+
+
+def _band_keys(signatures, bands, rows):
+    """Combine the ``rows`` signature values of each band into one uint64 key."""
+    keys = np.zeros((len(signatures), bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(rows):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + signatures[:, r::rows][:, :bands].astype(np.uint64)
+    return keys
+
+
+class NameIndex:
+    """MinHash/LSH candidate index over a table of company names.
+
+    ``bands * rows`` hash functions are used; two names whose n-gram Jaccard
+    similarity is ``s`` become candidates with probability
+    ``1 - (1 - s**rows)**bands``: with the defaults about 0.96 at ``s = 0.5``
+    and 0.5 at ``s = 0.3``.  Bigrams keep one-letter typos in short names
+    above the default threshold, which trigrams often do not.
+
+    Band buckets holding more than ``max_bucket`` names (band values shared by
+    many names, e.g. a common ``Company`` prefix) are skipped at lookup, which
+    keeps the candidates per query bounded; exact matches are unaffected.
+    """
+
+    def __init__(self, names, ngram=DEFAULT_NGRAM, bands=DEFAULT_BANDS, rows=DEFAULT_ROWS,
+                 max_bucket=DEFAULT_MAX_BUCKET, seed=0):
+        self.names = pd.Index(names)
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = rows
+        self.max_bucket = max_bucket
+        rng = np.random.default_rng(seed)
+        size = bands * rows
+        self._a = rng.integers(1, int(_PRIME), size=size, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=size, dtype=np.uint64)
+
+        self.normalized = normalize_names(self.names).to_numpy(dtype=object)
+        self.signatures = self.signatures_of(self.normalized)
+        keys = _band_keys(self.signatures, bands, rows)
+        self._order = np.argsort(keys, axis=0, kind="stable")
+        self._keys = np.take_along_axis(keys, self._order, axis=0)
+        # First row of every normalized name, for exact matches.
+        self._exact = pd.Series(np.arange(len(self.normalized)), index=self.normalized)
+        self._exact = self._exact[~self._exact.index.duplicated()]
+
+    @classmethod
+    def from_frame(cls, frame, column="Company", **kwargs):
+        return cls(frame[column].to_numpy(), **kwargs)
+
+    def __len__(self):
+        return len(self.names)
+
+    def signatures_of(self, normalized):
+        """MinHash signatures (``(len(normalized), bands * rows)`` uint32) of normalized names."""
+        normalized = pd.Series(normalized, dtype=object)
+        out = np.empty((len(normalized), len(self._a)), dtype=np.uint32)
+        for start in range(0, len(normalized), _BATCH):
+            codes, valid = _ngram_codes(normalized.iloc[start:start + _BATCH], self.ngram)
+            for h, (a, b) in enumerate(zip(self._a, self._b)):
+                hashed = (codes * a + b) % _PRIME
+                hashed[~valid] = _PRIME
+                out[start:start + len(codes), h] = hashed.min(axis=1)
+        return out
+
+    def _candidates(self, keys):
+        """All (query row, index row) pairs that share a band, deduplicated."""
+        queries, matches = [], []
+        for band in range(self.bands):
+            sorted_keys = self._keys[:, band]
+            low = np.searchsorted(sorted_keys, keys[:, band], side="left")
+            high = np.searchsorted(sorted_keys, keys[:, band], side="right")
+            sizes = high - low
+            sizes[sizes > self.max_bucket] = 0
+            rows = np.repeat(np.arange(len(keys)), sizes)
+            # Offsets low[q], low[q] + 1, ..., high[q] - 1 for every query q.
+            starts = np.repeat(low - np.cumsum(sizes) + sizes, sizes)
+            queries.append(rows)
+            matches.append(self._order[starts + np.arange(len(rows)), band])
+        pairs = np.unique(
+            np.concatenate(queries).astype(np.int64) * len(self) + np.concatenate(matches)
+        )
+        return pairs // len(self), pairs % len(self)
+
+    @instrumented("match_names")
+    def match(self, names, threshold=DEFAULT_THRESHOLD):
+        """Best match in the index for every name in ``names``.
+
+        Returns a frame with one row per query: ``Query``, ``Match`` (the
+        indexed name, NaN below ``threshold``), ``Position`` (its row in the
+        index, ``-1`` when unmatched) and ``Score`` in ``[0, 1]``.
+        """
+        names = pd.Series(names, dtype=object).reset_index(drop=True)
+        normalized = normalize_names(names).to_numpy(dtype=object)
+        position = np.full(len(names), -1, dtype=np.int64)
+        score = np.zeros(len(names))
+
+        exact = self._exact.reindex(normalized).to_numpy()
+        found = ~np.isnan(exact) & (normalized != "")
+        position[found] = exact[found]
+        score[found] = 1.0
+
+        fuzzy = np.flatnonzero(~found & (normalized != ""))
+        for start in range(0, len(fuzzy) if len(self) else 0, _QUERY_BATCH):
+            batch = fuzzy[start:start + _QUERY_BATCH]
+            signatures = self.signatures_of(normalized[batch])
+            queries, candidates = self._candidates(_band_keys(signatures, self.bands, self.rows))
+            if len(queries) == 0:
+                continue
+            agree = np.zeros(len(queries), dtype=np.int32)
+            for h in range(signatures.shape[1]):
+                agree += signatures[queries, h] == self.signatures[candidates, h]
+            scores = agree / signatures.shape[1]
+            # Best candidate per query: highest score, then lowest position.
+            order = np.lexsort((candidates, -scores, queries))
+            first = order[np.r_[True, np.diff(queries[order]) != 0]]
+            best = scores[first] >= threshold
+            rows = batch[queries[first][best]]
+            position[rows] = candidates[first][best]
+            score[rows] = scores[first][best]
+
+        match = self.names.take(position, allow_fill=True, fill_value=np.nan)
+        return pd.DataFrame({
+            "Query": names,
+            "Match": np.asarray(match, dtype=object),
+            "Position": position,
+            "Score": score,
+        })
+
+    def resolve(self, name, threshold=DEFAULT_THRESHOLD):
+        """Return ``(matched name, score)`` for one name, or ``(None, 0.0)``."""
+        row = self.match([name], threshold).iloc[0]
+        if row["Position"] < 0:
+            return None, 0.0
+        return row["Match"], float(row["Score"])
@@ -0,0 +1,189 @@
+"""Headless batch rendering of the EDA charts.
+
+Charts are described by picklable :class:`ChartSpec` objects that carry
+precomputed data (histogram counts, box-plot values, bar heights).
+:func:`render_charts` draws them on the Agg backend in worker processes and
+keeps the PNG/SVG bytes in an on-disk cache keyed by a digest of the data and
+the spec, so an unchanged chart is never drawn twice.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from .atomic import atomic_path
+from .cube import AggregateCube
+from .features import derive
+from .histogram import Histogram, month_histogram
+from .instrument import disable, instrumented
+
+
+class ChartSpec:
+    """One chart: its ``kind``, its data and its presentation options.
+
+    Kinds and the data they expect:
+
+    * ``"histogram"``: a :class:`~unicorn_eda.histogram.Histogram`;
+    * ``"boxplot"``: a 1-D array of values;
+    * ``"bar"``: ``{"labels": [...], "series": {name: heights}}``, drawn as
+      grouped bars when there is more than one series.
+    """
+
+    def __init__(self, kind, data, title="", xlabel="", ylabel="", format="png",
+                 figsize=(6.4, 4.8), options=None):
+        self.kind = kind
+        self.data = data
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.format = format
+        self.figsize = tuple(figsize)
+        self.options = dict(options or {})
+
+    def key(self):
+        """Hex digest identifying the rendered output of this spec."""
+        digest = hashlib.sha256()
+        _update_digest(digest, self.data)
+        presentation = [self.kind, self.title, self.xlabel, self.ylabel,
+                        self.format, self.figsize, sorted(self.options.items())]
+        digest.update(json.dumps(presentation, default=repr).encode())
+        return digest.hexdigest()
+
+
+def _update_digest(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(str(value.dtype).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, Histogram):
+        _update_digest(digest, [value.edges, value.counts, value.labels])
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode())
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"[{len(value)}".encode())
+        for item in value:
+            _update_digest(digest, item)
+    else:
+        digest.update(repr(value).encode())
+
+
+def _draw(spec, ax):
+    if spec.kind == "histogram":
+        spec.data.plot(ax, **spec.options)
+    elif spec.kind == "boxplot":
+        ax.boxplot(np.asarray(spec.data), **spec.options)
+    elif spec.kind == "bar":
+        labels = list(spec.data["labels"])
+        series = spec.data["series"]
+        positions = np.arange(len(labels))
+        width = 0.8 / max(len(series), 1)
+        for i, (name, heights) in enumerate(series.items()):
+            offset = (i - (len(series) - 1) / 2) * width
+            ax.bar(positions + offset, heights, width, label=str(name), **spec.options)
+        ax.set_xticks(positions, labels)
+        if len(series) > 1:
+            ax.legend()
+    else:
+        raise ValueError(f"unknown chart kind: {spec.kind!r}")
+
+
+@instrumented("render")
+def render_chart(spec):
+    """Render ``spec`` with the Agg backend and return the image bytes."""
+    # Figure + FigureCanvasAgg avoid pyplot's global state and GUI backends.
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=spec.figsize)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    _draw(spec, ax)
+    ax.set_title(spec.title)
+    ax.set_xlabel(spec.xlabel)
+    ax.set_ylabel(spec.ylabel)
+    figure.tight_layout()
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=spec.format)
+    return buffer.getvalue()
+
+
+def render_charts(specs, cache_dir=None, processes=None):
+    """Render ``specs`` in parallel, reusing cached output; returns bytes per spec.
+
+    With ``cache_dir`` set, output is stored as ``<key>.<format>`` there and
+    only specs without a cached file are rendered.  ``processes=1`` renders
+    in this process.
+    """
+    specs = list(specs)
+    results = [None] * len(specs)
+    cache_dir = None if cache_dir is None else Path(cache_dir)
+    paths = [None] * len(specs)
+    missing = []
+    for i, spec in enumerate(specs):
+        if cache_dir is not None:
+            paths[i] = cache_dir / f"{spec.key()}.{spec.format}"
+            if paths[i].exists():
+                results[i] = paths[i].read_bytes()
+                continue
+        missing.append(i)
+
+    if processes == 1 or len(missing) <= 1:
+        rendered = map(render_chart, (specs[i] for i in missing))
+        _store(missing, rendered, results, paths)
+    else:
+        # Forked workers would otherwise write to the parent's profiling sink.
+        with ProcessPoolExecutor(max_workers=processes, initializer=disable) as pool:
+            rendered = pool.map(render_chart, (specs[i] for i in missing))
+            _store(missing, rendered, results, paths)
+    return results
+
+
+def _store(indices, rendered, results, paths):
+    for i, image in zip(indices, rendered):
+        results[i] = image
+        if paths[i] is not None:
+            with atomic_path(paths[i]) as tmp:
+                tmp.write_bytes(image)
+
+
+def eda_chart_specs(frame, label="", years=None, format="png"):
+    """Chart specs for the structuring EDA of one (slice of the) companies frame.
+
+    Covers the Year Founded, Month Joined and Years to Unicorn histograms, the
+    Years to Unicorn box plot and the average valuation per quarter bars for
+    ``years`` (the two latest join years by default).
+    """
+    frame = derive(frame, ["Month Number Joined", "Years to Unicorn"], inplace=False)
+    prefix = f"{label}: " if label else ""
+    years_to_unicorn = frame["Years to Unicorn"].dropna().to_numpy()
+
+    quarters = AggregateCube.from_frame(frame, dimensions=("Year Joined", "Quarter")).query(["Year Joined", "Quarter"])
+    if years is None:
+        years = sorted(quarters.index.get_level_values("Year Joined").unique())[-2:]
+    mean_valuation = quarters[("Valuation", "mean")] / 1e9
+    series = {
+        year: [float(mean_valuation.get((year, quarter), np.nan)) for quarter in range(1, 5)]
+        for year in years
+    }
+
+    return [
+        ChartSpec("histogram", Histogram.from_values(frame["Year Founded"], bins=30),
+                  f"{prefix}Histogram of Year Founded", "Year Founded", "Count", format),
+        ChartSpec("histogram", month_histogram(frame["Month Number Joined"]),
+                  f"{prefix}Histogram of Date Joined", "Month Joined", "Count", format,
+                  options={"edgecolor": "black"}),
+        ChartSpec("histogram", Histogram.from_values(years_to_unicorn, bins=30),
+                  f"{prefix}Histogram of Years to Unicorn", "Years to Unicorn", "Count", format),
+        ChartSpec("boxplot", years_to_unicorn,
+                  f"{prefix}Box Plot of Years to Join", "", "Years to Unicorn", format),
+        ChartSpec("bar", {"labels": ["Q1", "Q2", "Q3", "Q4"], "series": series},
+                  f"{prefix}Average valuation per quarter", "Quarter number",
+                  "Average valuation (billions of dollars)", format),
+    ]
@@ -0,0 +1,329 @@
+"""Asyncio HTTP service answering the structuring questions.
+
+The dataset is loaded and summarized once at startup; each request is then
+answered from the precomputed counts and :class:`~unicorn_eda.cube.AggregateCube`.
+Run from the ``work`` directory::
+
+    python -m unicorn_eda.service --data Unicorn_Companies.csv --port 8080
+
+``--data`` may also point to a column store written by
+:func:`~unicorn_eda.store.save_store`.  Endpoints (GET, JSON responses)::
+
+    /counts?by=year_founded|year_joined|month_joined
+    /years-to-unicorn
+    /industries/most-common?year=2015&n=3
+    /industries/top?n=5&by=Valuation
+    /health
+
+Answers are kept in a :class:`~unicorn_eda.memo.ResultCache` keyed by the
+dataset fingerprint and the normalized query (``--cache-dir`` keeps them on
+disk between restarts).  Identical requests arriving while an answer is
+being computed are coalesced: they all await the one computation instead of
+starting their own.  Computations run in a thread pool so slow queries do
+not stall other connections.
+
+For local testing, :meth:`QueryService.query` can be awaited directly, and
+:func:`start_server` accepts ``port=0`` to bind a free port.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .cube import AggregateCube
+from .dedup import fingerprint as row_fingerprints
+from .features import MONTH_ABBREVIATIONS, derive
+from .instrument import configure_from_env
+from .loader import file_digest, load_companies
+from .memo import ResultCache, normalize_query
+from .stats import IntCounts
+from .store import open_store
+
+
+DEFAULT_CACHE_SIZE = 256
+
+_SERVICE_FEATURES = ("Year Joined", "Month Number Joined", "Years to Unicorn")
+_MAX_REQUEST_LINE = 8192
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+class UnicornQueries:
+    """Synchronous answers to the service's questions over one companies frame."""
+
+    def __init__(self, frame, fingerprint=None):
+        derive(frame, [name for name in _SERVICE_FEATURES if name not in frame])
+        self.rows = len(frame)
+        if fingerprint is None:
+            fingerprint = hashlib.sha256(row_fingerprints(frame).tobytes()).hexdigest()
+        self.fingerprint = fingerprint
+        self.cube = AggregateCube.from_frame(frame)
+        self.counts = {
+            "year_founded": IntCounts(frame["Year Founded"]),
+            "year_joined": IntCounts(frame["Year Joined"].dropna()),
+            "month_joined": IntCounts(frame["Month Number Joined"].dropna()),
+        }
+        self.years_to_unicorn = IntCounts(frame["Years to Unicorn"].dropna())
+
+    @classmethod
+    def from_path(cls, path, cache=None):
+        """Load a companies CSV, or a column store directory, and summarize it.
+
+        With a :class:`~unicorn_eda.memo.ResultCache`, the dataset's
+        fingerprint is recorded there, dropping answers cached for earlier
+        contents of ``path``.
+        """
+        if Path(path).is_dir():
+            store = open_store(path)
+            queries = cls(store.to_frame(), store.source_digest)
+            if cache is not None:
+                cache.track_dataset(path, queries.fingerprint)
+            return queries
+        digest = file_digest(path) if cache is None else cache.dataset_fingerprint(path)
+        return cls(load_companies(path, digest=digest), digest)
+
+    def count(self, by="year_joined"):
+        if by not in self.counts:
+            raise ValueError(f"by must be one of {', '.join(self.counts)}")
+        counts = self.counts[by]
+        present = np.flatnonzero(counts.counts)
+        values = counts.values[present]
+        if by == "month_joined":
+            labels = [MONTH_ABBREVIATIONS[value - 1] for value in values]
+        else:
+            labels = [str(value) for value in values]
+        return dict(zip(labels, counts.counts[present].tolist()))
+
+    def years_to_unicorn_stats(self):
+        return {str(key): value for key, value in self.years_to_unicorn.describe().items()}
+
+    def most_common_industries(self, year, n=1):
+        """Industries with the most companies joining in ``year``, ties by name."""
+        companies = self.cube.query("Industry", where={"Year Joined": year})[("Companies", "count")]
+        companies = companies[(companies > 0) & companies.index.notna()]
+        companies.index = companies.index.astype(str)
+        companies = companies.sort_index().sort_values(ascending=False, kind="stable")
+        return {"year": year, "industries": [
+            {"industry": industry, "companies": int(count)}
+            for industry, count in companies.head(n).items()
+        ]}
+
+    def top_industries(self, n=5, by="Valuation"):
+        if by not in ("Valuation", "Funding"):
+            raise ValueError("by must be Valuation or Funding")
+        top = self.cube.query("Industry")
+        top = top[top.index.notna()].nlargest(n, (by, "sum"))
+        return [
+            {
+                "industry": str(industry),
+                "companies": int(row[("Companies", "count")]),
+                "valuation": float(row[("Valuation", "sum")]),
+                "funding": float(row[("Funding", "sum")]),
+            }
+            for industry, row in top.iterrows()
+        ]
+
+
+def _int_param(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        raise ValueError(f"missing parameter {name!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer") from None
+
+
+# path -> (function(queries, params), parameter defaults).  Defaults are part
+# of the normalized cache key, so "/industries/top" and "/industries/top?n=5"
+# share one entry.
+_ROUTES = {
+    "/counts": (lambda q, p: q.count(p["by"]), {"by": "year_joined"}),
+    "/years-to-unicorn": (lambda q, p: q.years_to_unicorn_stats(), {}),
+    "/industries/most-common": (
+        lambda q, p: q.most_common_industries(_int_param(p, "year"), _int_param(p, "n")),
+        {"n": "1"},
+    ),
+    "/industries/top": (
+        lambda q, p: q.top_industries(_int_param(p, "n"), p["by"]),
+        {"n": "5", "by": "Valuation"},
+    ),
+    "/health": (lambda q, p: {"status": "ok", "rows": q.rows}, {}),
+}
+
+
+class NotFound(LookupError):
+    pass
+
+
+def _route(path, params):
+    """Return ``(path, params with defaults)`` for a request, or raise :class:`NotFound`."""
+    path = "/" + path.strip("/")
+    if path not in _ROUTES:
+        raise NotFound(path)
+    _, defaults = _ROUTES[path]
+    return path, {**defaults, **{key: str(value) for key, value in params.items()}}
+
+
+class QueryService:
+    """Cached, coalescing asynchronous front end to :class:`UnicornQueries`."""
+
+    def __init__(self, queries, cache=None, executor=None):
+        self.queries = queries
+        self.cache = ResultCache(DEFAULT_CACHE_SIZE) if cache is None else cache
+        self.executor = executor
+        self._in_flight = {}
+        self.coalesced = 0
+
+    def _compute(self, path, params):
+        function, _ = _ROUTES[path]
+        return function(self.queries, params)
+
+    async def query(self, path, params=None):
+        """Answer ``path`` with query ``params`` (a mapping of strings)."""
+        path, params = _route(path, params or {})
+        query = f"{path}?{normalize_query(params)}"
+        fingerprint = self.queries.fingerprint
+        missing = object()
+        result = self.cache.get(fingerprint, query, missing)
+        if result is not missing:
+            self.cache.hits += 1
+            return result
+        if query in self._in_flight:
+            self.coalesced += 1
+            return await asyncio.shield(self._in_flight[query])
+
+        self.cache.misses += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._compute, path, params)
+        self._in_flight[query] = future
+        try:
+            result = await asyncio.shield(future)
+        finally:
+            del self._in_flight[query]
+        return self.cache.put(fingerprint, query, result)
+
+    def stats(self):
+        return {"hits": self.cache.hits, "misses": self.cache.misses,
+                "coalesced": self.coalesced, "cached": len(self.cache)}
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def _read_request(reader):
+    """Return (method, target, headers) or None when the client has gone."""
+    line = await reader.readline()
+    if not line:
+        return None
+    if len(line) > _MAX_REQUEST_LINE:
+        raise ValueError("request line too long")
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        header = await reader.readline()
+        if header in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = header.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    return method, target, headers
+
+
+async def _respond(service, method, target):
+    if method != "GET":
+        return 405, {"error": "only GET is supported"}
+    url = urlsplit(target)
+    try:
+        return 200, await service.query(url.path, dict(parse_qsl(url.query)))
+    except NotFound:
+        return 404, {"error": f"unknown endpoint {url.path}"}
+    except ValueError as error:
+        return 400, {"error": str(error)}
+    except Exception as error:  # noqa: BLE001 - reported to the client
+        return 500, {"error": f"{type(error).__name__}: {error}"}
+
+
+def _handler(service):
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError):
+                    request, status, body = None, 400, {"error": "malformed request"}
+                    keep_alive = False
+                else:
+                    if request is None:
+                        break
+                    method, target, headers = request
+                    status, body = await _respond(service, method, target)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                payload = json.dumps(body, default=_json_default).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    .encode("latin-1") + payload
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    return handle
+
+
+async def start_server(service, host="127.0.0.1", port=8080):
+    """Start serving ``service``; returns the :class:`asyncio.Server`."""
+    return await asyncio.start_server(_handler(service), host, port)
+
+
+async def _serve(args):
+    cache = ResultCache(args.cache_size, args.cache_dir)
+    service = QueryService(UnicornQueries.from_path(args.data, cache), cache)
+    server = await start_server(service, args.host, args.port)
+    for sock in server.sockets:
+        print(f"serving {args.data} on http://{sock.getsockname()[0]}:{sock.getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default="Unicorn_Companies.csv",
+                        help="companies CSV or column store directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--cache-dir", help="also keep answers on disk here between runs")
+    args = parser.parse_args(argv)
+    configure_from_env()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""Mergeable summary statistics computed in one pass.
+
+Year-like columns (``Year Founded``, ``Year Joined``, ``Years to Unicorn``)
+span a small integer range, so exact value counts are both tiny and
+mergeable: counts from separate chunks or partitions simply add up, and the
+mean, median, mode and any quantile fall out of the counts without keeping
+the rows (:class:`IntCounts`).
+
+Unbounded float columns such as Valuation get an approximate, equally
+mergeable KLL quantile sketch (:class:`KLLSketch`).  :func:`describe_values`
+picks the exact path when the values are integers over a small range.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_QUANTILES = (0.25, 0.5, 0.75)
+
+# Integer columns spanning more distinct values than this use the sketch.
+MAX_EXACT_RANGE = 1 << 20
+
+
+def integer_values(values):
+    """``values`` without its missing entries, as ``int64``.
+
+    Float values are accepted when they are all whole numbers (a year column
+    holding NaN is float); ``None`` is returned when any value is fractional
+    or infinite.
+    """
+    values = pd.Series(values, copy=False).dropna()
+    if values.dtype.kind in "iub":
+        return values.to_numpy(dtype=np.int64)
+    floats = values.to_numpy(dtype=np.float64)
+    if not np.isfinite(floats).all() or (floats != np.trunc(floats)).any():
+        return None
+    return floats.astype(np.int64)
+
+
+class IntCounts:
+    """Exact counts of integer values over a dense ``[offset, offset + len)`` range.
+
+    Missing values (NaN, ``pd.NA``) are skipped; fractional values are
+    rejected with ``ValueError`` rather than truncated.
+    """
+
+    def __init__(self, values=None):
+        self.offset = 0
+        self.counts = np.zeros(0, dtype=np.int64)
+        if values is not None:
+            self.add(values)
+
+    def _cover(self, low, high):
+        """Grow ``counts`` so that it covers ``[low, high]``."""
+        if len(self.counts) == 0:
+            self.offset = low
+            self.counts = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_low = min(low, self.offset)
+        new_high = max(high, self.offset + len(self.counts) - 1)
+        if new_low == self.offset and new_high - new_low + 1 == len(self.counts):
+            return
+        grown = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        start = self.offset - new_low
+        grown[start:start + len(self.counts)] = self.counts
+        self.offset, self.counts = new_low, grown
+
+    def add(self, values):
+        """Count every non-missing value in ``values`` (whole numbers only)."""
+        values = integer_values(values)
+        if values is None:
+            raise ValueError("IntCounts only counts whole numbers; use KLLSketch for other values")
+        if len(values) == 0:
+            return self
+        low, high = int(values.min()), int(values.max())
+        self._cover(low, high)
+        start = low - self.offset
+        self.counts[start:start + high - low + 1] += np.bincount(values - low)
+        return self
+
+    def merge(self, other):
+        """Add the counts of ``other`` into this object."""
+        if other.total:
+            self._cover(other.offset, other.offset + len(other.counts) - 1)
+            start = other.offset - self.offset
+            self.counts[start:start + len(other.counts)] += other.counts
+        return self
+
+    @property
+    def values(self):
+        return np.arange(self.offset, self.offset + len(self.counts))
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def value_counts(self):
+        """Counts as a Series ordered like ``Series.value_counts()`` (largest first)."""
+        present = np.flatnonzero(self.counts)
+        series = pd.Series(self.counts[present], index=self.values[present], name="count")
+        return series.sort_values(ascending=False, kind="stable")
+
+    def mean(self):
+        if not self.total:
+            return np.nan
+        return float(np.dot(self.values, self.counts) / self.total)
+
+    def quantile(self, q):
+        """Quantile with linear interpolation, matching ``Series.quantile``."""
+        total = self.total
+        if not total:
+            return np.nan
+        position = q * (total - 1)
+        below, above = int(np.floor(position)), int(np.ceil(position))
+        cumulative = np.cumsum(self.counts)
+        low, high = self.values[np.searchsorted(cumulative, [below + 1, above + 1])]
+        return float(low + (high - low) * (position - below))
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def mode(self):
+        """Most frequent value; the smallest one on ties, like ``mode().values[0]``."""
+        if not self.total:
+            return None
+        return int(self.offset + np.argmax(self.counts))
+
+    def describe(self, quantiles=DEFAULT_QUANTILES):
+        """Count, mean, median, mode, min, max and ``quantiles`` from the counts."""
+        result = {
+            "count": self.total,
+            "mean": self.mean(),
+            "median": self.median(),
+            "mode": self.mode(),
+        }
+        present = np.flatnonzero(self.counts)
+        result["min"] = int(self.offset + present[0]) if len(present) else None
+        result["max"] = int(self.offset + present[-1]) if len(present) else None
+        for q in quantiles:
+            result[q] = self.quantile(q)
+        return result
+
+
+class KLLSketch:
+    """Mergeable approximate quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    Items live in levels of compactors; an item at level ``h`` stands for
+    ``2**h`` inputs.  When a level outgrows its capacity it is sorted and every
+    other item (random offset) is promoted to the next level.  With the default
+    ``k=200`` the rank error is around 1% and the sketch keeps a few hundred
+    floats however many values it has seen.  Count, sum, min and max are exact.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.levels = [np.zeros(0)]
+        self.count = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(int(math.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.zeros(0))
+                items = np.sort(items)
+                # An odd item out stays behind so no weight is lost.
+                keep = items[len(items) - len(items) % 2:]
+                promoted = items[self._rng.integers(2):len(items) - len(keep):2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """Add every non-NaN value of ``values``."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Fold another sketch (built with the same ``k``) into this one."""
+        if other.k != self.k:
+            raise ValueError("only sketches with the same k can be merged")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.zeros(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    @property
+    def total(self):
+        return self.count
+
+    def mean(self):
+        return self.sum / self.count if self.count else np.nan
+
+    def quantiles(self, qs):
+        """Approximate quantiles for each ``q`` in ``qs``."""
+        qs = np.asarray(qs, dtype=np.float64)
+        if not self.count:
+            return np.full(qs.shape, np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(values), 2 ** level) for level, values in enumerate(self.levels)]
+        )
+        order = np.argsort(items, kind="stable")
+        items, cumulative = items[order], np.cumsum(weights[order])
+        ranks = qs * (cumulative[-1] - 1)
+        positions = np.minimum(np.searchsorted(cumulative, ranks, side="right"), len(items) - 1)
+        result = items[positions]
+        # The extremes are tracked exactly.
+        result = np.where(qs <= 0, self.min, result)
+        return np.where(qs >= 1, self.max, result)
+
+    def quantile(self, q):
+        return float(self.quantiles([q])[0])
+
+    def median(self):
+        return self.quantile(0.5)
+
+    def describe(self, quantiles=DEFAULT_QUANTILES):
+        """Count, mean, min, max (exact) and approximate median and ``quantiles``."""
+        result = {
+            "count": self.count,
+            "mean": self.mean(),
+            "median": self.median(),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+        for q, value in zip(quantiles, self.quantiles(quantiles)):
+            result[q] = float(value)
+        return result
+
+
+def summarize_values(values, max_exact_range=MAX_EXACT_RANGE, k=200):
+    """Return a mergeable summary of ``values`` built in one pass.
+
+    Whole numbers spanning at most ``max_exact_range`` distinct values give an
+    exact :class:`IntCounts`; anything else a :class:`KLLSketch`.  Missing
+    values are skipped either way.
+    """
+    integers = integer_values(values)
+    if integers is not None and len(integers):
+        if int(integers.max()) - int(integers.min()) < max_exact_range:
+            return IntCounts(integers)
+    return KLLSketch(k).update(pd.Series(values, copy=False).to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+def describe_values(values, quantiles=DEFAULT_QUANTILES, max_exact_range=MAX_EXACT_RANGE):
+    """Mean, median, mode (exact path only) and quantiles of ``values`` in one pass."""
+    return summarize_values(values, max_exact_range).describe(quantiles)
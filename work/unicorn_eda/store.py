@@ -0,0 +1,218 @@
+"""Memory-mapped column store for the structured companies table.
+
+:func:`save_store` writes a structured frame as a directory holding one
+``.npy`` file per column, the category dictionaries (``categories.json``) and
+a ``manifest.json`` describing both.  :func:`open_store` maps those files
+read-only, so any number of processes can open the same dataset: the pages
+are shared through the OS page cache and opening costs milliseconds no
+matter how many rows there are.
+
+Columns are laid out so they can be wrapped without copying:
+
+* numeric and ``datetime64`` columns are stored as-is; nullable integer,
+  float and boolean columns store their values plus a boolean missing mask;
+* categoricals store their integer codes, the labels live in
+  ``categories.json``;
+* text columns (``Company``, ``Select Investors``) store UTF-8 bytes plus
+  ``int64`` offsets and an optional validity bitmap, the Arrow ``large_string``
+  layout.  With pyarrow installed they are wrapped zero-copy as pandas string
+  arrays; without it they are decoded on access.
+
+The frames returned are backed by read-only maps; pandas copy-on-write copies
+a column the first time it is modified.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .atomic import atomic_path
+from .encoding import CategoryDictionary
+from .instrument import instrumented
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - text columns are decoded instead
+    pyarrow = None
+
+
+STORE_VERSION = 2
+
+_MANIFEST = "manifest.json"
+_CATEGORIES = "categories.json"
+_MASKED_ARRAYS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+def _text_buffers(values):
+    """Return (data, offsets, validity or None) for a column of strings."""
+    values = pd.Series(values, copy=False)
+    missing = values.isna().to_numpy()
+    encoded = [b"" if gone else str(value).encode("utf-8")
+               for value, gone in zip(values.to_numpy(dtype=object), missing)]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    validity = np.packbits(~missing, bitorder="little") if missing.any() else None
+    return data, offsets, validity
+
+
+def _save_array(directory, name, array):
+    np.save(directory / name, np.ascontiguousarray(array), allow_pickle=False)
+    return name
+
+
+@instrumented("save_store")
+def save_store(frame, directory, source_digest=None):
+    """Write ``frame`` as a memory-mappable column store under ``directory``.
+
+    The store is built in a sibling temporary directory and swapped in with
+    two renames (old store aside, new store into place), so readers never
+    see a half-written store and the previous one is only removed once its
+    replacement is in place.  Processes that already have the previous store
+    open keep reading the columns they have mapped from its (unlinked)
+    files; columns are mapped on first access, so reopen after a swap.
+    ``source_digest`` is recorded in the manifest, e.g. the
+    :func:`~unicorn_eda.loader.file_digest` of the CSV it was built from.
+    """
+    directory = Path(directory)
+    with atomic_path(directory) as tmp:
+        tmp.mkdir()
+
+        categories = CategoryDictionary()
+        columns = []
+        for position, name in enumerate(frame.columns):
+            values = frame[name]
+            stem = f"col{position:03d}"
+            entry = {"name": name}
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                categories.categories[name] = values.cat.categories.tolist()
+                entry["kind"] = "category"
+                entry["ordered"] = bool(values.cat.ordered)
+                entry["codes"] = _save_array(tmp, f"{stem}.npy", values.array.codes)
+            elif isinstance(values.array, _MASKED_ARRAYS):
+                entry["kind"] = "masked"
+                entry["dtype"] = str(values.dtype)
+                entry["values"] = _save_array(
+                    tmp, f"{stem}.npy", values.to_numpy(values.dtype.numpy_dtype, na_value=0)
+                )
+                entry["mask"] = _save_array(tmp, f"{stem}.mask.npy", values.isna().to_numpy())
+            elif values.dtype.kind in "biufcmM":
+                entry["kind"] = "array"
+                entry["values"] = _save_array(tmp, f"{stem}.npy", values.to_numpy())
+            else:
+                data, offsets, validity = _text_buffers(values)
+                entry["kind"] = "text"
+                entry["data"] = _save_array(tmp, f"{stem}.data.npy", data)
+                entry["offsets"] = _save_array(tmp, f"{stem}.offsets.npy", offsets)
+                if validity is not None:
+                    entry["validity"] = _save_array(tmp, f"{stem}.valid.npy", validity)
+            columns.append(entry)
+
+        categories.save(tmp / _CATEGORIES)
+        manifest = {
+            "version": STORE_VERSION,
+            "rows": len(frame),
+            "source_digest": source_digest,
+            "columns": columns,
+        }
+        with open(tmp / _MANIFEST, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, ensure_ascii=False, indent=1)
+
+    return ColumnStore.open(directory)
+
+
+class ColumnStore:
+    """Read-only view of a store written by :func:`save_store`."""
+
+    def __init__(self, directory, manifest, categories):
+        self.directory = Path(directory)
+        self.rows = manifest["rows"]
+        self.source_digest = manifest.get("source_digest")
+        self.categories = categories
+        self._entries = {entry["name"]: entry for entry in manifest["columns"]}
+        self._series = {}
+
+    @classmethod
+    def open(cls, directory):
+        directory = Path(directory)
+        with open(directory / _MANIFEST, encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"{directory} has store version {manifest.get('version')}, "
+                f"expected {STORE_VERSION}"
+            )
+        return cls(directory, manifest, CategoryDictionary.load(directory / _CATEGORIES))
+
+    @property
+    def columns(self):
+        return list(self._entries)
+
+    @property
+    def shape(self):
+        return (self.rows, len(self._entries))
+
+    def __len__(self):
+        return self.rows
+
+    def _map(self, name):
+        # A plain ndarray view of the map: shares its pages, avoids np.memmap quirks.
+        return np.load(self.directory / name, mmap_mode="r", allow_pickle=False).view(np.ndarray)
+
+    def _text(self, entry):
+        data = self._map(entry["data"])
+        offsets = self._map(entry["offsets"])
+        validity = self._map(entry["validity"]) if "validity" in entry else None
+        if pyarrow is not None:
+            array = pyarrow.LargeStringArray.from_buffers(
+                self.rows,
+                pyarrow.py_buffer(offsets),
+                pyarrow.py_buffer(data),
+                None if validity is None else pyarrow.py_buffer(validity),
+            )
+            return pd.array(array, dtype=pd.StringDtype("pyarrow", na_value=np.nan))
+        raw = data.tobytes()
+        values = np.array(
+            [raw[start:stop].decode("utf-8") for start, stop in zip(offsets[:-1], offsets[1:])],
+            dtype=object,
+        )
+        if validity is not None:
+            valid = np.unpackbits(validity, count=self.rows, bitorder="little").astype(bool)
+            values[~valid] = np.nan
+        return values
+
+    def column(self, name):
+        """Return column ``name`` as a Series backed by the mapped file."""
+        if name not in self._series:
+            entry = self._entries[name]
+            if entry["kind"] == "category":
+                dtype = pd.CategoricalDtype(
+                    self.categories.categories.get(name, []), ordered=entry["ordered"]
+                )
+                values = pd.Categorical.from_codes(
+                    self._map(entry["codes"]), dtype=dtype, validate=False
+                )
+            elif entry["kind"] == "array":
+                values = self._map(entry["values"])
+            elif entry["kind"] == "masked":
+                array_type = pd.api.types.pandas_dtype(entry["dtype"]).construct_array_type()
+                values = array_type(self._map(entry["values"]), self._map(entry["mask"]))
+            else:
+                values = self._text(entry)
+            self._series[name] = pd.Series(values, name=name, copy=False)
+        return self._series[name]
+
+    def to_frame(self, columns=None):
+        """Return the stored table (or just ``columns``) as a DataFrame."""
+        columns = self.columns if columns is None else list(columns)
+        return pd.DataFrame({name: self.column(name) for name in columns}, copy=False)
+
+
+@instrumented("open_store")
+def open_store(directory):
+    """Open the column store under ``directory`` without reading any column data."""
+    return ColumnStore.open(directory)
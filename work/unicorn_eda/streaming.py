@@ -0,0 +1,145 @@
+"""Chunked version of the structuring pipeline for files larger than memory.
+
+:func:`summarize_csv` reads the CSV ``chunksize`` rows at a time and folds
+every chunk into a :class:`PipelineSummary` of mergeable partial aggregates:
+exact integer counts for the year/month histograms and Years to Unicorn,
+per-industry sums for Valuation and Funding, and KLL sketches for their
+approximate median and quantiles.  Memory stays bounded by the
+chunk size plus the size of the aggregates (and one 8-byte fingerprint per
+distinct row for duplicate detection, see :mod:`unicorn_eda.dedup`).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .dates import DateMemo
+from .dedup import Deduplicator
+from .encoding import CategoryDictionary
+from .features import derive
+from .instrument import instrumented
+from .loader import SCHEMA, csv_dtypes, structure_frame
+from .stats import IntCounts, KLLSketch
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+_MONEY_COLUMNS = ["Valuation", "Funding"]
+
+
+class PipelineSummary:
+    """Mergeable aggregates matching the outputs of the structuring script."""
+
+    def __init__(self):
+        self.rows_read = 0
+        self.rows_kept = 0
+        self.year_founded = IntCounts()
+        self.year_joined = IntCounts()
+        self.month_joined = IntCounts()
+        self.years_to_unicorn = IntCounts()
+        self.money = {column: KLLSketch() for column in _MONEY_COLUMNS}
+        self.industry_totals = pd.DataFrame(columns=_MONEY_COLUMNS, dtype=np.float64)
+
+    @property
+    def duplicates_dropped(self):
+        return self.rows_read - self.rows_kept
+
+    def add_frame(self, frame):
+        """Fold a structured, already de-duplicated frame into the aggregates."""
+        frame = derive(frame, ["Year Joined", "Month Number Joined", "Years to Unicorn"], inplace=False)
+        self.rows_kept += len(frame)
+        self.year_founded.add(frame["Year Founded"].dropna().to_numpy())
+        self.year_joined.add(frame["Year Joined"].dropna().to_numpy())
+        self.month_joined.add(frame["Month Number Joined"].dropna().to_numpy())
+        self.years_to_unicorn.add(frame["Years to Unicorn"].dropna().to_numpy())
+        for column, sketch in self.money.items():
+            sketch.update(frame[column].to_numpy())
+        totals = frame.groupby("Industry", observed=True)[_MONEY_COLUMNS].sum()
+        self._add_industry_totals(totals)
+        return self
+
+    def _add_industry_totals(self, totals):
+        totals = totals.set_axis(totals.index.astype(object))
+        self.industry_totals = self.industry_totals.add(totals, fill_value=0)
+
+    def merge(self, other):
+        """Add the aggregates of another summary (e.g. from another partition)."""
+        self.rows_read += other.rows_read
+        self.rows_kept += other.rows_kept
+        self.year_founded.merge(other.year_founded)
+        self.year_joined.merge(other.year_joined)
+        self.month_joined.merge(other.month_joined)
+        self.years_to_unicorn.merge(other.years_to_unicorn)
+        for column, sketch in self.money.items():
+            sketch.merge(other.money[column])
+        self._add_industry_totals(other.industry_totals)
+        return self
+
+    def years_to_unicorn_stats(self):
+        """Mean, median and mode of Years to Unicorn, as the script prints them."""
+        return {
+            "mean": self.years_to_unicorn.mean(),
+            "median": self.years_to_unicorn.median(),
+            "mode": self.years_to_unicorn.mode(),
+        }
+
+    def top_industries(self, n=5, by="Valuation"):
+        """Industries with the largest summed ``by`` column."""
+        return self.industry_totals.nlargest(n, by)
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE, schema=SCHEMA, date_memo=None, categories=None):
+    """Yield ``(raw_chunk, structure)`` pairs while reading ``path`` in chunks.
+
+    ``structure(frame)`` applies the shared schema conversion with one date
+    memo and one category dictionary for the whole file.
+    """
+    date_memo = DateMemo() if date_memo is None else date_memo
+    categories = CategoryDictionary() if categories is None else categories
+
+    def structure(frame):
+        return structure_frame(frame, schema, date_memo=date_memo, categories=categories)
+
+    reader = pd.read_csv(
+        path,
+        usecols=list(schema),
+        dtype=csv_dtypes(schema),
+        chunksize=chunksize,
+    )
+    with reader:
+        for chunk in reader:
+            yield chunk, structure
+
+
+@instrumented("summarize_csv")
+def summarize_csv(path, chunksize=DEFAULT_CHUNKSIZE, drop_duplicates=True, dedup=None):
+    """Run the structuring pipeline over ``path`` in chunks of ``chunksize`` rows.
+
+    Pass the same ``dedup`` (a :class:`~unicorn_eda.dedup.Deduplicator`) to
+    several calls to drop rows already seen in earlier snapshot files.
+    """
+    summary = PipelineSummary()
+    if drop_duplicates and dedup is None:
+        dedup = Deduplicator()
+    for chunk, structure in iter_chunks(path, chunksize):
+        summary.rows_read += len(chunk)
+        if dedup is not None:
+            chunk = dedup.drop_duplicates(chunk)
+        summary.add_frame(structure(chunk))
+    return summary
+
+
+def summarize_frame(frame, drop_duplicates=True, dedup=None):
+    """Build a :class:`PipelineSummary` from an in-memory structured frame.
+
+    Duplicates are dropped by row fingerprint, as in :func:`summarize_csv`;
+    pass ``dedup`` to share the seen set with other structured frames.
+    """
+    summary = PipelineSummary()
+    summary.rows_read = len(frame)
+    if drop_duplicates and dedup is None:
+        dedup = Deduplicator()
+    if dedup is not None:
+        frame = dedup.drop_duplicates(frame)
+    return summary.add_frame(frame)